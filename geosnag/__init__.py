@@ -1,4 +1,5 @@
 # GeoSnag - Photo Geo-Tagging Tool for Synology NAS
+import sys
 from importlib.metadata import PackageNotFoundError, version
 
 try:
@@ -13,3 +14,9 @@ PROJECT_NAME = "GeoSnag"
 PROJECT_TAG = "Exif.Image.Software"
 MARKER_PREFIX = "GeoSnag:"
 INDEX_FILENAME = ".geosnag_index.json"
+
+# ── Shared dataclass options ──
+# Per-file records (PhotoMeta, MatchResult, WriteResult, ...) are created once
+# per photo and read in tight loops; slots (Python 3.10+) drop the per-instance
+# __dict__. Splat into @dataclass(**DATACLASS_SLOTS).
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
@@ -17,39 +17,26 @@ Usage:
 from __future__ import annotations
 
 import argparse
-import csv
-import hashlib
+import itertools
 import logging
 import os
 import sys
 import time
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
 from datetime import timedelta
-
-import yaml
+from typing import TYPE_CHECKING
 
 from . import INDEX_FILENAME, PROJECT_NAME
 from . import __version__ as VERSION
-from .index import ScanIndex
-from .matcher import MatchStats, match_photos
-from .parallel import scan_with_index
-from .scanner import PHOTO_EXTS
-from .writer import _EXIFTOOL, _PYEXIV2_OK, write_gps_to_exif, write_gps_xmp_sidecar
 
+# Heavy modules (yaml, csv, EXIF libraries, write backends) are imported
+# where first used, so --help and --version return without loading them.
+if TYPE_CHECKING:
+    from .matcher import MatchStats
 
-def _build_source_fingerprints(all_photos: list) -> dict:
-    """Precompute per-date fingerprint of GPS source filepaths.
-
-    Returns a dict mapping date_key (YYYY-MM-DD) to a truncated SHA-256 hex
-    digest.  The fingerprint changes whenever a GPS source is added or removed
-    for that date, invalidating any cached "no_match" results for targets on
-    that day.
-    """
-    by_date: dict[str, list[str]] = defaultdict(list)
-    for p in all_photos:
-        if p.has_gps and p.datetime_original:
-            by_date[p.date_key].append(p.filepath)
-    return {date: hashlib.sha256("|".join(sorted(paths)).encode()).hexdigest()[:16] for date, paths in by_date.items()}
+# Confidence histogram labels, lowest bucket first
+_CONFIDENCE_BUCKETS = ("< 50%", "50-69%", "70-89%", "90-100%")
 
 
 def setup_logging(level: str = "INFO", log_file: str = None):
@@ -70,8 +57,15 @@ def setup_logging(level: str = "INFO", log_file: str = None):
 
 def load_config(config_path: str) -> dict:
     """Load and validate configuration from YAML file."""
+    import yaml
+
+    from .scanner import PHOTO_EXTS
+
+    # libyaml's C loader when PyYAML was built with it; same safe semantics
+    SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
     with open(config_path, "r") as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=SafeLoader)
 
     # Defaults
     config.setdefault("recursive", True)
@@ -129,31 +123,40 @@ def print_banner():
 def print_scan_summary(all_photos: list, stats: MatchStats):
     """Print summary of scanned photos."""
     total = len(all_photos)
-    with_gps = sum(1 for p in all_photos if p.has_gps)
-    with_dt = sum(1 for p in all_photos if p.datetime_original)
-    errors = sum(1 for p in all_photos if p.scan_error)
-    processed = sum(1 for p in all_photos if p.geosnag_processed)
-    no_gps = sum(1 for p in all_photos if not p.has_gps and not p.geosnag_processed)
-    eligible = sum(1 for p in all_photos if not p.has_gps and not p.geosnag_processed and p.datetime_original)
-
-    # Unique devices
-    devices = set()
+    with_gps = with_dt = errors = processed = no_gps = eligible = 0
+    devices = set()  # distinct PhotoMeta.device_label values
+    lines = []
+
+    # Single pass over all photos — this list can hold millions of entries
     for p in all_photos:
+        if p.has_gps:
+            with_gps += 1
+        if p.datetime_original:
+            with_dt += 1
+        if p.scan_error:
+            errors += 1
+        if p.geosnag_processed:
+            processed += 1
+        elif not p.has_gps:
+            no_gps += 1
+            if p.datetime_original:
+                eligible += 1
         if p.camera_make or p.camera_model:
-            devices.add(f"{p.camera_make or ''} {p.camera_model or ''}".strip())
-
-    print("  SCAN RESULTS")
-    print("  ────────────")
-    print(f"  Total photos:       {total:>6d}")
-    print(f"    With GPS:         {with_gps:>6d}  (usable as GPS sources)")
-    print(f"    Without GPS:      {no_gps:>6d}  (candidates for enrichment)")
-    print(f"    Already processed:{processed:>6d}  ({PROJECT_NAME} tag found, skipped)")
-    print(f"    With datetime:    {with_dt:>6d}")
-    print(f"    Eligible targets: {eligible:>6d}  (no GPS + has datetime + not processed)")
-    print(f"    Scan errors:      {errors:>6d}")
+            devices.add(p.device_label)
+
+    lines.append("  SCAN RESULTS")
+    lines.append("  ────────────")
+    lines.append(f"  Total photos:       {total:>6d}")
+    lines.append(f"    With GPS:         {with_gps:>6d}  (usable as GPS sources)")
+    lines.append(f"    Without GPS:      {no_gps:>6d}  (candidates for enrichment)")
+    lines.append(f"    Already processed:{processed:>6d}  ({PROJECT_NAME} tag found, skipped)")
+    lines.append(f"    With datetime:    {with_dt:>6d}")
+    lines.append(f"    Eligible targets: {eligible:>6d}  (no GPS + has datetime + not processed)")
+    lines.append(f"    Scan errors:      {errors:>6d}")
     if devices:
-        print(f"    Devices:          {', '.join(sorted(devices))}")
-    print()
+        lines.append(f"    Devices:          {', '.join(sorted(devices))}")
+    lines.append("")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def print_match_summary(
@@ -163,41 +166,41 @@ def print_match_summary(
     cached_unmatched_count: int = 0,
 ):
     """Print summary of matching results."""
-    print("  MATCHING RESULTS")
-    print("  ────────────────")
-    print(f"  GPS sources:        {stats.sources:>6d}  across {stats.source_dates} dates")
-    print(f"  Eligible targets:   {stats.targets:>6d}")
-    print(f"  Already processed:  {stats.already_processed:>6d}")
-    print(f"  Matched:            {stats.matched:>6d}  ({stats.matched / max(stats.targets, 1) * 100:.1f}%)")
-    print(f"  Unmatched:          {stats.unmatched:>6d}")
-    print(f"  No datetime:        {stats.without_datetime:>6d}")
+    lines = []
+    lines.append("  MATCHING RESULTS")
+    lines.append("  ────────────────")
+    lines.append(f"  GPS sources:        {stats.sources:>6d}  across {stats.source_dates} dates")
+    lines.append(f"  Eligible targets:   {stats.targets:>6d}")
+    lines.append(f"  Already processed:  {stats.already_processed:>6d}")
+    lines.append(f"  Matched:            {stats.matched:>6d}  ({stats.matched / max(stats.targets, 1) * 100:.1f}%)")
+    lines.append(f"  Unmatched:          {stats.unmatched:>6d}")
+    lines.append(f"  No datetime:        {stats.without_datetime:>6d}")
     if cached_unmatched_count > 0:
-        print(f"  Cache skipped:      {cached_unmatched_count:>6d}  (unchanged since last run)")
+        lines.append(f"  Cache skipped:      {cached_unmatched_count:>6d}  (unchanged since last run)")
 
     if matches:
-        print()
-        print(f"  Avg confidence:     {stats.avg_confidence:>6.1f}%")
-        print(f"  Avg time delta:     {stats.avg_time_delta_min:>6.1f} min")
+        lines.append("")
+        lines.append(f"  Avg confidence:     {stats.avg_confidence:>6.1f}%")
+        lines.append(f"  Avg time delta:     {stats.avg_time_delta_min:>6.1f} min")
 
-        # Confidence distribution
-        conf_buckets = {"90-100%": 0, "70-89%": 0, "50-69%": 0, "< 50%": 0}
+        # Confidence distribution — bucket index is the number of
+        # thresholds the confidence reaches (bools sum as 0/1)
+        counts = [0, 0, 0, 0]
         for m in matches:
-            if m.confidence >= 90:
-                conf_buckets["90-100%"] += 1
-            elif m.confidence >= 70:
-                conf_buckets["70-89%"] += 1
-            elif m.confidence >= 50:
-                conf_buckets["50-69%"] += 1
-            else:
-                conf_buckets["< 50%"] += 1
+            c = m.confidence
+            counts[(c >= 50) + (c >= 70) + (c >= 90)] += 1
 
-        print()
-        print("  Confidence distribution:")
-        for bucket, count in conf_buckets.items():
-            bar = "█" * int(count / max(len(matches), 1) * 30)
-            print(f"    {bucket:>8s}: {count:>4d}  {bar}")
+        # Bars are 30 chars at 100%; integer floor-division keeps a full
+        # bucket at exactly 30 where float scaling can round down to 29
+        total = len(matches)
+        lines.append("")
+        lines.append("  Confidence distribution:")
+        for bucket, count in zip(reversed(_CONFIDENCE_BUCKETS), reversed(counts)):
+            bar = "█" * (count * 30 // total)
+            lines.append(f"    {bucket:>8s}: {count:>4d}  {bar}")
 
-    print()
+    lines.append("")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def print_match_preview(matches: list, max_show: int = 20):
@@ -205,24 +208,29 @@ def print_match_preview(matches: list, max_show: int = 20):
     if not matches:
         return
 
-    print("  MATCH PREVIEW (first {} of {})".format(min(max_show, len(matches)), len(matches)))
-    print("  ─" * 50)
-    print(f"  {'Target File':<42s} {'Δ Time':>10s} {'Conf':>5s}  {'GPS Source':<35s}")
-    print(f"  {'─' * 42} {'─' * 10} {'─' * 5}  {'─' * 35}")
+    total = len(matches)
+    shown = matches[:max_show]
+    lines = []
 
-    for m in matches[:max_show]:
-        tgt_name = os.path.basename(m.target.filepath)
+    lines.append("  MATCH PREVIEW (first {} of {})".format(len(shown), total))
+    lines.append("  ─" * 50)
+    lines.append(f"  {'Target File':<42s} {'Δ Time':>10s} {'Conf':>5s}  {'GPS Source':<35s}")
+    lines.append(f"  {'─' * 42} {'─' * 10} {'─' * 5}  {'─' * 35}")
+
+    for m in shown:
+        tgt_name = m.target.filename
         if len(tgt_name) > 40:
             tgt_name = tgt_name[:37] + "..."
-        src_name = os.path.basename(m.source.filepath)
+        src_name = m.source.filename
         if len(src_name) > 33:
             src_name = src_name[:30] + "..."
 
-        print(f"  {tgt_name:<42s} {m.time_delta_str:>10s} {m.confidence:>5.1f}  {src_name:<35s}")
+        lines.append(f"  {tgt_name:<42s} {m.time_delta_str:>10s} {m.confidence:>5.1f}  {src_name:<35s}")
 
-    if len(matches) > max_show:
-        print(f"  ... and {len(matches) - max_show} more")
-    print()
+    if total > len(shown):
+        lines.append(f"  ... and {total - len(shown)} more")
+    lines.append("")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def save_report(
@@ -232,12 +240,46 @@ def save_report(
     report_path: str,
 ):
     """Save detailed match report to CSV."""
-    with open(report_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
+    import csv
 
-        # Header
+    def match_rows():
+        for m in matches:
+            tgt = m.target
+            src = m.source
+            yield (
+                "MATCHED",
+                tgt.filepath,
+                tgt.datetime_iso,
+                tgt.device_label,
+                src.filepath,
+                src.datetime_iso,
+                f"{src.gps_latitude:.6f}" if src.gps_latitude else "",
+                f"{src.gps_longitude:.6f}" if src.gps_longitude else "",
+                f"{m.time_delta_minutes:.1f}",
+                f"{m.confidence:.1f}",
+            )
+
+    def unmatched_rows():
+        for u in unmatched:
+            yield (
+                "UNMATCHED",
+                u.filepath,
+                u.datetime_iso,
+                u.device_label,
+                "",
+                "",
+                "",
+                "",
+                "",
+                "",
+            )
+
+    # Rows are generated lazily and handed to the C writer in bulk; a 1 MiB
+    # buffer keeps write syscalls rare on large reports.
+    with open(report_path, "w", newline="", encoding="utf-8", buffering=1 << 20) as f:
+        writer = csv.writer(f)
         writer.writerow(
-            [
+            (
                 "Status",
                 "Target File",
                 "Target DateTime",
@@ -248,97 +290,106 @@ def save_report(
                 "Longitude",
                 "Time Delta (min)",
                 "Confidence (%)",
-            ]
+            )
         )
+        writer.writerows(match_rows())
+        writer.writerows(unmatched_rows())
 
-        for m in matches:
-            writer.writerow(
-                [
-                    "MATCHED",
-                    m.target.filepath,
-                    m.target.datetime_original.isoformat() if m.target.datetime_original else "",
-                    f"{m.target.camera_make or ''} {m.target.camera_model or ''}".strip(),
-                    m.source.filepath,
-                    m.source.datetime_original.isoformat() if m.source.datetime_original else "",
-                    f"{m.source.gps_latitude:.6f}" if m.source.gps_latitude else "",
-                    f"{m.source.gps_longitude:.6f}" if m.source.gps_longitude else "",
-                    f"{m.time_delta_minutes:.1f}",
-                    f"{m.confidence:.1f}",
-                ]
-            )
+    logging.getLogger(PROJECT_NAME.lower()).info(f"Report saved to {report_path}")
 
-        for u in unmatched:
-            writer.writerow(
-                [
-                    "UNMATCHED",
-                    u.filepath,
-                    u.datetime_original.isoformat() if u.datetime_original else "",
-                    f"{u.camera_make or ''} {u.camera_model or ''}".strip(),
-                    "",
-                    "",
-                    "",
-                    "",
-                    "",
-                    "",
-                ]
-            )
 
-    logging.getLogger(PROJECT_NAME.lower()).info(f"Report saved to {report_path}")
+def _write_one(m, do_exif: bool, do_xmp: bool, stamp_xmp: bool, batch) -> list:
+    """Write GPS from one match to its target. Returns the WriteResult of each write."""
+    from .writer import write_gps_to_exif, write_gps_xmp_sidecar
+
+    lat = m.source.gps_latitude
+    lon = m.source.gps_longitude
+    alt = m.source.gps_altitude
+
+    results = []
+
+    if do_exif:
+        result = write_gps_to_exif(
+            m.target.filepath,
+            lat,
+            lon,
+            alt,
+            stamp_after_write=True,
+            batch=batch,
+        )
+        results.append(result)
+
+    if do_xmp:
+        result = write_gps_xmp_sidecar(
+            m.target.filepath,
+            lat,
+            lon,
+            alt,
+            stamp_after_write=stamp_xmp,
+            batch=batch,
+        )
+        results.append(result)
+
+    return results
 
 
 def apply_matches(
     matches: list,
     write_mode: str,
     min_confidence: float,
+    workers: int = 1,
 ) -> tuple:
-    """Apply GPS data from matches to target files. Returns (success, fail) counts."""
+    """Apply GPS data from matches to target files. Returns (success, fail) counts.
+
+    Writes run on a thread pool of ``workers`` threads; each target file is
+    written by exactly one thread. pyexiv2 is not thread-safe, so the writer
+    serializes its calls: with pyexiv2, EXIF writes get no parallelism and an
+    EXIF-only run uses a single thread. XMP sidecars and exiftool writes run
+    in parallel.
+    """
+    from .writer import _PYEXIV2_OK, BatchExifWriter, _resolve_exiftool, reset_run_stamp
+
+    reset_run_stamp()
     success = 0
     fail = 0
     apply_logger = logging.getLogger(f"{PROJECT_NAME.lower()}.apply")
 
-    for i, m in enumerate(matches, 1):
-        if m.confidence < min_confidence:
-            apply_logger.debug(
-                f"Skipping {m.target.filename}: confidence {m.confidence:.1f}% < threshold {min_confidence:.1f}%"
-            )
-            continue
-
-        lat = m.source.gps_latitude
-        lon = m.source.gps_longitude
-        alt = m.source.gps_altitude
-
-        results = []
-
-        if write_mode in ("exif", "both"):
-            result = write_gps_to_exif(
-                m.target.filepath,
-                lat,
-                lon,
-                alt,
-                stamp_after_write=True,
-            )
-            results.append(result)
-
-        if write_mode in ("xmp_sidecar", "both"):
-            result = write_gps_xmp_sidecar(
-                m.target.filepath,
-                lat,
-                lon,
-                alt,
-                stamp_after_write=(write_mode == "xmp_sidecar"),
-            )
-            results.append(result)
-
-        if all(r.success for r in results):
-            success += 1
-        else:
-            fail += 1
-            for r in results:
-                if not r.success:
-                    apply_logger.error(f"  Write failed ({r.method}): {r.error}")
-
-        if i % 50 == 0:
-            apply_logger.info(f"  Progress: {i}/{len(matches)} ({success} OK, {fail} failed)")
+    eligible = [m for m in matches if m.confidence >= min_confidence]
+    skipped = len(matches) - len(eligible)
+    if skipped:
+        apply_logger.info(f"  {skipped} matches skipped below confidence threshold {min_confidence:.1f}%")
+
+    # Resolve the write mode once rather than per match
+    do_exif = write_mode in {"exif", "both"}
+    do_xmp = write_mode in {"xmp_sidecar", "both"}
+    stamp_xmp = write_mode == "xmp_sidecar"  # with "both", the EXIF write already stamps
+
+    # Without pyexiv2, keep exiftool processes alive for the whole run instead
+    # of paying Perl startup on every file — one per write thread.
+    exiftool = None if _PYEXIV2_OK else _resolve_exiftool()
+    batch = BatchExifWriter(exiftool, processes=workers) if exiftool else None
+
+    # Every pyexiv2 write holds the writer's lock, so with nothing else to
+    # overlap (no sidecars) extra threads would only queue on it
+    if _PYEXIV2_OK and not do_xmp:
+        workers = 1
+
+    with batch if batch is not None else nullcontext():
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = [pool.submit(_write_one, m, do_exif, do_xmp, stamp_xmp, batch) for m in eligible]
+
+            for i, future in enumerate(as_completed(futures), 1):
+                results = future.result()
+                if all(r.success for r in results):
+                    success += 1
+                else:
+                    fail += 1
+                    for r in results:
+                        if not r.success:
+                            apply_logger.error(f"  Write failed ({r.method}): {r.error}")
+
+                if i % 50 == 0:
+                    apply_logger.info(f"  Progress: {i}/{len(eligible)} ({success} OK, {fail} failed)")
 
     return success, fail
 
@@ -417,7 +468,7 @@ Examples:
         "--workers",
         type=int,
         default=None,
-        help="Number of parallel scan threads (default: 4, from config)",
+        help="Number of parallel scan/write threads (default: 4, from config)",
     )
     parser.add_argument(
         "--reindex",
@@ -434,13 +485,22 @@ Examples:
         action="store_true",
         help="Force re-evaluation of all targets, ignore match cache",
     )
+    parser.add_argument(
+        "--version",
+        action="version",
+        version=f"{PROJECT_NAME} {VERSION}",
+    )
 
     args = parser.parse_args()
 
-    # Resolve config path relative to current working directory
-    config_path = args.config
-    if not os.path.isabs(config_path):
-        config_path = os.path.join(os.getcwd(), config_path)
+    from .index import ScanIndex
+    from .matcher import match_photos
+    from .parallel import scan_with_index
+
+    # Resolve config path relative to current working directory, once;
+    # the index lives next to it
+    config_path = os.path.abspath(args.config)
+    config_dir = os.path.dirname(config_path)
 
     if not os.path.exists(config_path):
         print(f"Error: Config file not found: {config_path}")
@@ -475,17 +535,25 @@ Examples:
     # ── Backend validation ──
     write_mode = config.get("write_mode", "exif")
     is_dry_run = config["dry_run"]
-    if not is_dry_run and write_mode in ("exif", "both") and not _PYEXIV2_OK and not _EXIFTOOL:
-        print("  ✗  No EXIF write backend available.")
-        print()
-        print("     pyexiv2 could not be loaded (glibc version mismatch).")
-        print("     ExifTool was not found at: exiftool, /opt/bin/exiftool, /usr/bin/exiftool")
-        print()
-        print("     On Synology DSM, install ExifTool via Entware:")
-        print("       opkg install perl-image-exiftool")
-        print()
-        print("     Then re-run geosnag --apply")
-        sys.exit(1)
+    if not is_dry_run and write_mode in ("exif", "both"):
+        # Only a live write needs the backend; dry runs never import the writer.
+        from .writer import _PYEXIV2_OK, _exiftool_runs, _resolve_exiftool
+
+        exiftool = None if _PYEXIV2_OK else _resolve_exiftool()
+        if not _PYEXIV2_OK and not (exiftool and _exiftool_runs(exiftool)):
+            print("  ✗  No EXIF write backend available.")
+            print()
+            print("     pyexiv2 could not be loaded (glibc version mismatch).")
+            if exiftool:
+                print(f"     ExifTool was found at {' '.join(exiftool)} but does not run (is Perl installed?)")
+            else:
+                print("     ExifTool was not found at: exiftool, /opt/bin/exiftool, /usr/bin/exiftool")
+            print()
+            print("     On Synology DSM, install ExifTool via Entware:")
+            print("       opkg install perl-image-exiftool")
+            print()
+            print("     Then re-run geosnag --apply")
+            sys.exit(1)
 
     is_dry_run = config["dry_run"]
     if is_dry_run:
@@ -508,11 +576,7 @@ Examples:
     # Set up index
     index = None
     if config.get("use_index", True):
-        index_path = os.path.join(
-            os.path.dirname(os.path.abspath(config_path)),
-            INDEX_FILENAME,
-        )
-        index = ScanIndex(index_path)
+        index = ScanIndex(os.path.join(config_dir, INDEX_FILENAME))
         if args.reindex:
             logger.info("--reindex: clearing cached index")
             index.clear()
@@ -559,8 +623,8 @@ Examples:
 
     # ── Match cache: skip targets confirmed unmatched on previous run ──
     cached_unmatched = []
+    source_fps = index.source_fingerprints if index is not None else None
     if index is not None and not getattr(args, "rematch", False):
-        source_fps = _build_source_fingerprints(all_photos)
         filtered = []
         for p in photos_to_match:
             if p.has_gps:
@@ -574,27 +638,17 @@ Examples:
         photos_to_match = filtered
         if cached_unmatched:
             logger.info(f"Match cache: {len(cached_unmatched)} targets skipped (unmatched on previous run)")
-    else:
-        source_fps = None
 
     matches, unmatched, stats = match_photos(photos_to_match, max_time_delta=max_delta)
 
     # ── Update match cache in index ──
     if index is not None:
-        if source_fps is None:
-            source_fps = _build_source_fingerprints(all_photos)
-        for m in matches:
-            index.update_match_result(
-                m.target.filepath,
-                "matched",
-                source_fps.get(m.target.date_key, ""),
-            )
-        for u in unmatched:
-            index.update_match_result(
-                u.filepath,
-                "no_match",
-                source_fps.get(u.date_key, ""),
+        index.update_match_results_bulk(
+            itertools.chain(
+                ((m.target.filepath, "matched", source_fps.get(m.target.date_key, "")) for m in matches),
+                ((u.filepath, "no_match", source_fps.get(u.date_key, "")) for u in unmatched),
             )
+        )
         index.save()
 
     # Merge cached unmatched into stats for reporting
@@ -637,6 +691,7 @@ Examples:
         matches,
         write_mode=config["write_mode"],
         min_confidence=min_conf,
+        workers=workers,
     )
 
     write_time = time.time() - t2
@@ -2,19 +2,29 @@
 index.py — Scan index/cache for GeoSnag.
 
 Persists scan results to a JSON file so repeat runs skip EXIF reads
-for files that haven't changed (same mtime + size).
+for files that haven't changed (same mtime + size). When only the mtime
+differs (files copied, restored or rsynced without -t), a partial content
+hash of the head and tail of the file decides instead.
 
 Also caches match results: targets confirmed as "no_match" are skipped
 on subsequent runs if the set of GPS sources for that date hasn't changed.
+The per-date source fingerprints are persisted alongside the entries and
+only recomputed for dates whose GPS sources were added or removed.
+
+Small saves don't rewrite the whole file: changed entries and fingerprints
+are appended as one JSON line to "<index>.log" and replayed on load. Once the
+log grows past a tenth of the snapshot it is folded back in (compacted).
 
 Index structure:
   {
     "version": 4,
     "match_threshold_minutes": 120,
+    "source_fingerprints": {"2017-09-23": "9f2c4e1a0b7d3c58"},
     "entries": {
       "/abs/path/photo.nef": {
         "mtime": 1234567890.123,
         "size": 26400000,
+        "content_hash": "3b1f0c9a7d2e4f6a8b0c1d2e3f405162",
         "datetime_original": "2017-09-23T23:11:37",
         "has_gps": false,
         "gps_latitude": null,
@@ -33,18 +43,45 @@ Index structure:
 
 from __future__ import annotations
 
+import hashlib
+import itertools
 import json
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional
+from operator import itemgetter
+from typing import Iterable, Optional
 
 from . import INDEX_FILENAME, PROJECT_NAME
 from .scanner import PhotoMeta
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json produces the same file
+    orjson = None
+
 logger = logging.getLogger(f"{PROJECT_NAME.lower()}.index")
 
 INDEX_VERSION = 4
+LOG_SUFFIX = ".log"
+_COMPACT_RATIO = 0.1  # rewrite the snapshot once the log exceeds this fraction of it
+_HASH_CHUNK = 64 * 1024  # bytes hashed from each end of a file for content_hash
+
+
+def _dumps_index(data: dict) -> bytes:
+    """Serialize index data to compact UTF-8 JSON, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _loads_index(raw: bytes) -> dict:
+    """Parse index JSON bytes, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
 
 
 def _default_index_path(config_path: str) -> str:
@@ -53,11 +90,18 @@ def _default_index_path(config_path: str) -> str:
     return os.path.join(config_dir, INDEX_FILENAME)
 
 
-def _photo_to_entry(meta: PhotoMeta) -> dict:
-    """Convert PhotoMeta to serializable index entry."""
+def _photo_to_entry(meta: PhotoMeta, stat: Optional[tuple] = None, f=None) -> dict:
+    """Convert PhotoMeta to serializable index entry.
+
+    ``stat`` is an (mtime, size) pair already taken for this file; when
+    omitted the file is stat'ed here. ``f`` is the scan's open binary
+    handle, reused for the content hash instead of opening the file again.
+    """
+    mtime, size = stat or _stat_file(meta.filepath) or (None, None)
     return {
-        "mtime": _get_mtime(meta.filepath),
-        "size": _get_size(meta.filepath),
+        "mtime": mtime,
+        "size": size,
+        "content_hash": _content_hash(meta.filepath, size, f) if size is not None else None,
         "datetime_original": meta.datetime_original.isoformat() if meta.datetime_original else None,
         "has_gps": meta.has_gps,
         "gps_latitude": meta.gps_latitude,
@@ -71,8 +115,13 @@ def _photo_to_entry(meta: PhotoMeta) -> dict:
 
 
 def _entry_to_photo(filepath: str, entry: dict) -> PhotoMeta:
-    """Convert index entry back to PhotoMeta."""
-    dt_str = entry.get("datetime_original")
+    """Convert index entry back to PhotoMeta.
+
+    Runs once per cache hit, so it avoids os.path.splitext (which rescans
+    the whole path) and takes the extension from the basename instead.
+    """
+    get = entry.get
+    dt_str = get("datetime_original")
     dt = None
     if dt_str:
         try:
@@ -80,34 +129,87 @@ def _entry_to_photo(filepath: str, entry: dict) -> PhotoMeta:
         except (ValueError, TypeError):
             pass
 
+    filename = os.path.basename(filepath)
+    dot = filename.rfind(".")
     return PhotoMeta(
         filepath=filepath,
-        filename=os.path.basename(filepath),
-        extension=os.path.splitext(filepath)[1].lower(),
+        filename=filename,
+        extension=filename[dot:].lower() if dot > 0 else "",
         datetime_original=dt,
-        has_gps=entry.get("has_gps", False),
-        gps_latitude=entry.get("gps_latitude"),
-        gps_longitude=entry.get("gps_longitude"),
-        gps_altitude=entry.get("gps_altitude"),
-        camera_make=entry.get("camera_make"),
-        camera_model=entry.get("camera_model"),
-        geosnag_processed=entry.get("geosnag_processed", False),
-        scan_error=entry.get("scan_error"),
+        has_gps=get("has_gps", False),
+        gps_latitude=get("gps_latitude"),
+        gps_longitude=get("gps_longitude"),
+        gps_altitude=get("gps_altitude"),
+        camera_make=get("camera_make"),
+        camera_model=get("camera_model"),
+        geosnag_processed=get("geosnag_processed", False),
+        scan_error=get("scan_error"),
     )
 
 
-def _get_mtime(filepath: str) -> Optional[float]:
+def _entry_source_date(entry: Optional[dict]) -> Optional[str]:
+    """Return the YYYY-MM-DD date an entry contributes a GPS source to, if any."""
+    if not entry or not entry.get("has_gps"):
+        return None
+    dt_str = entry.get("datetime_original")
+    return dt_str[:10] if dt_str else None
+
+
+def _fingerprint_paths(sorted_paths) -> str:
+    """Fingerprint sorted GPS source paths as a 16-hex-char BLAKE2b digest.
+
+    This is a cache key, not a security boundary, so the cheaper 8-byte
+    BLAKE2b is used instead of SHA-256. Paths are NUL-separated, since NUL
+    is the one character a path cannot contain.
+    """
+    h = hashlib.blake2b(digest_size=8)
+    for path in sorted_paths:
+        h.update(path.encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _stat_slice(filepaths: list) -> list:
+    """Stat a slice of paths on one worker thread (see ScanIndex.lookup_many)."""
+    return [_stat_file(p) for p in filepaths]
+
+
+def _content_hash(filepath: str, size: int, f=None) -> Optional[str]:
+    """Hash the file size plus its first and last 64 KiB.
+
+    Not a full-file digest — RAW files run to tens of MB — but enough to
+    recognise the same photo after its mtime changed. Reads through ``f``
+    (an open binary handle) when given, otherwise opens ``filepath``.
+    Returns None if the file can't be read.
+    """
+    h = hashlib.blake2b(str(size).encode(), digest_size=16)
     try:
-        return os.path.getmtime(filepath)
+        if f is None:
+            with open(filepath, "rb") as f:
+                _hash_ends(h, f, size)
+        else:
+            f.seek(0)
+            _hash_ends(h, f, size)
     except OSError:
         return None
+    return h.hexdigest()
+
 
+def _hash_ends(h, f, size: int) -> None:
+    """Feed the first and last _HASH_CHUNK bytes of ``f`` into ``h``."""
+    h.update(f.read(_HASH_CHUNK))
+    if size > 2 * _HASH_CHUNK:
+        f.seek(-_HASH_CHUNK, os.SEEK_END)
+    h.update(f.read(_HASH_CHUNK))
 
-def _get_size(filepath: str) -> Optional[int]:
+
+def _stat_file(filepath: str) -> Optional[tuple]:
+    """Return (mtime, size) from a single stat call, or None if unreadable."""
     try:
-        return os.path.getsize(filepath)
+        st = os.stat(filepath)
     except OSError:
         return None
+    return st.st_mtime, st.st_size
 
 
 class ScanIndex:
@@ -132,8 +234,17 @@ class ScanIndex:
     def __init__(self, index_path: str):
         self.index_path = index_path
         self.entries = {}  # type: dict[str, dict]
+        self.source_fingerprints = {}  # type: dict[str, str]
         self._dirty = False
         self._match_threshold_minutes = None  # cached max_time_delta config
+        self._dirty_dates = set()  # type: set[str]
+        self._fingerprints_complete = True  # False → full rebuild needed
+        self._stat_cache = {}  # type: dict[str, tuple]  # lookup() misses, consumed by update()
+        self._log_path = index_path + LOG_SUFFIX
+        self._changed = set()  # type: set[str]  # paths changed/removed since last save
+        self._changed_dates = set()  # type: set[str]  # fingerprints changed since last save
+        self._compact = True  # next save must write a full snapshot
+        self._lock = threading.Lock()  # guards update() from scan worker threads
 
     def load(self) -> int:
         """Load index from disk. Returns number of cached entries."""
@@ -142,8 +253,8 @@ class ScanIndex:
             return 0
 
         try:
-            with open(self.index_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            with open(self.index_path, "rb") as f:
+                data = _loads_index(f.read())
 
             if data.get("version") != INDEX_VERSION:
                 logger.info(f"Index version mismatch (got {data.get('version')}, need {INDEX_VERSION}), rebuilding")
@@ -152,35 +263,56 @@ class ScanIndex:
 
             self.entries = data.get("entries", {})
             self._match_threshold_minutes = data.get("match_threshold_minutes")
+            # Indexes written before fingerprints were persisted need one full rebuild
+            self.source_fingerprints = data.get("source_fingerprints") or {}
+            self._fingerprints_complete = "source_fingerprints" in data
+            self._dirty_dates = set()
+            self._compact = not self._replay_log()
             logger.info(f"Loaded index with {len(self.entries)} cached entries")
             return len(self.entries)
 
-        except (json.JSONDecodeError, KeyError, TypeError) as e:
+        except (ValueError, KeyError, TypeError) as e:
             logger.warning(f"Corrupt index file, starting fresh: {e}")
             self.entries = {}
             return 0
 
     def save(self) -> None:
-        """Write index to disk."""
+        """Write index to disk.
+
+        Appends the changes since the last save to the log when that is
+        cheaper, otherwise writes a full snapshot.
+        """
         if not self._dirty:
             logger.debug("Index unchanged, skipping save")
             return
 
+        if not self._compact and self._append_log():
+            return
+
         data = {
             "version": INDEX_VERSION,
             "match_threshold_minutes": self._match_threshold_minutes,
+            "source_fingerprints": self.source_fingerprints,
             "entries": self.entries,
         }
 
-        # Write to temp file first, then rename (atomic on POSIX)
+        # Write to temp file first, then rename (atomic on POSIX). The log is
+        # removed before the rename: a crash in between loses the logged
+        # changes (files get rescanned) instead of replaying an old log onto
+        # the new snapshot.
         tmp_path = self.index_path + ".tmp"
         try:
-            with open(tmp_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, separators=(",", ":"))
+            with open(tmp_path, "wb") as f:
+                f.write(_dumps_index(data))
 
+            if os.path.exists(self._log_path):
+                os.remove(self._log_path)
             os.replace(tmp_path, self.index_path)
             logger.info(f"Index saved: {len(self.entries)} entries → {self.index_path}")
             self._dirty = False
+            self._compact = False
+            self._changed = set()
+            self._changed_dates = set()
 
         except OSError as e:
             logger.error(f"Failed to save index: {e}")
@@ -190,51 +322,235 @@ class ScanIndex:
                 except OSError as cleanup_err:
                     logger.warning(f"Could not clean up temp index file {tmp_path}: {cleanup_err}")
 
+    def _replay_log(self) -> bool:
+        """Apply logged changes on top of the loaded snapshot.
+
+        Returns False if the log is unreadable or ends in a partial line
+        (interrupted append), so the next save writes a clean snapshot.
+        """
+        try:
+            with open(self._log_path, "rb") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return True
+        except OSError as e:
+            logger.warning(f"Could not read index log {self._log_path}: {e}")
+            return False
+
+        for n, line in enumerate(lines):
+            try:
+                record = _loads_index(line)
+                entries = record.get("entries", {}).items()
+                fingerprints = record.get("source_fingerprints", {}).items()
+            except (ValueError, AttributeError):
+                # Partial line, or valid JSON that isn't a log record ([], 1, ...)
+                logger.warning(f"Ignoring truncated or corrupt index log after {n} records")
+                return False
+            for path, entry in entries:
+                if entry is None:
+                    self.entries.pop(path, None)
+                else:
+                    self.entries[path] = entry
+            for date, fp in fingerprints:
+                if fp is None:
+                    self.source_fingerprints.pop(date, None)
+                else:
+                    self.source_fingerprints[date] = fp
+        logger.debug(f"Replayed {len(lines)} index log records")
+        return True
+
+    def _append_log(self) -> bool:
+        """Append changes since the last save as one log record.
+
+        Returns False (caller writes a full snapshot) when there are no
+        tracked changes to append or the log would outgrow the snapshot.
+        """
+        if not self._changed and not self._changed_dates:
+            return False
+        entries = self.entries
+        fingerprints = self.source_fingerprints
+        record = {
+            "entries": {p: entries.get(p) for p in self._changed},
+            "source_fingerprints": {d: fingerprints.get(d) for d in self._changed_dates},
+        }
+        line = _dumps_index(record) + b"\n"
+        try:
+            snapshot_size = os.path.getsize(self.index_path)
+            log_size = os.path.getsize(self._log_path) if os.path.exists(self._log_path) else 0
+            if log_size + len(line) > snapshot_size * _COMPACT_RATIO:
+                return False
+            with open(self._log_path, "ab") as f:
+                f.write(line)
+        except OSError as e:
+            logger.debug(f"Index log append failed, writing snapshot instead: {e}")
+            return False
+
+        logger.info(f"Index saved: {len(self._changed)} changed entries → {self._log_path}")
+        self._dirty = False
+        self._changed = set()
+        self._changed_dates = set()
+        return True
+
     def lookup(self, filepath: str) -> Optional[PhotoMeta]:
         """
         Look up a file in the index. Returns PhotoMeta if cache is valid, None if miss.
 
-        Cache hit requires: file exists in index AND mtime matches AND size matches.
+        Cache hit requires: file exists in index AND size matches AND either
+        mtime matches or (mtime differs but) the partial content hash matches.
+        A content-hash hit refreshes the stored mtime. On a miss the stat
+        result is kept so the following update() for the same file does not
+        stat it again.
         """
-        entry = self.entries.get(filepath)
-        if entry is None:
-            return None
+        return self._lookup_stat(filepath, _stat_file(filepath))
 
-        current_mtime = _get_mtime(filepath)
-        current_size = _get_size(filepath)
+    def lookup_many(self, filepaths: list, workers: int = 4) -> tuple:
+        """Look up many files, stat'ing them concurrently.
 
-        cached_mtime = entry.get("mtime")
-        cached_size = entry.get("size")
+        The stat calls are split into one contiguous slice per worker thread
+        (os.stat releases the GIL, and on NAS/network mounts each call blocks
+        on the server); the cache comparison itself stays on the calling
+        thread. Results are equivalent to calling lookup() for each path.
 
-        if current_mtime is None or current_size is None:
+        Returns:
+            (hits, misses): PhotoMeta for valid cache entries, and the paths
+            that need scanning, both in input order.
+        """
+        n = len(filepaths)
+        workers = max(1, min(workers, n))
+        if workers == 1:
+            stats = [_stat_file(p) for p in filepaths]
+        else:
+            step = -(-n // workers)  # ceil division
+            slices = [filepaths[i : i + step] for i in range(0, n, step)]
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                stats = list(itertools.chain.from_iterable(pool.map(_stat_slice, slices)))
+
+        hits = []
+        misses = []
+        for filepath, stat in zip(filepaths, stats):
+            cached = self._lookup_stat(filepath, stat)
+            if cached is not None:
+                hits.append(cached)
+            else:
+                misses.append(filepath)
+        return hits, misses
+
+    def _lookup_stat(self, filepath: str, stat: Optional[tuple]) -> Optional[PhotoMeta]:
+        """Validate the cache entry for ``filepath`` against a stat result."""
+        if stat is None:
             return None
 
-        if cached_mtime != current_mtime or cached_size != current_size:
+        entry = self.entries.get(filepath)
+        if entry is None or entry.get("size") != stat[1]:
+            self._stat_cache[filepath] = stat
             return None
 
+        if entry.get("mtime") != stat[0]:
+            cached_hash = entry.get("content_hash")
+            if cached_hash is None or _content_hash(filepath, stat[1]) != cached_hash:
+                self._stat_cache[filepath] = stat
+                return None
+            entry["mtime"] = stat[0]
+            self._changed.add(filepath)
+            self._dirty = True
+
         return _entry_to_photo(filepath, entry)
 
-    def update(self, meta: PhotoMeta) -> None:
-        """Add or update a scan result in the index."""
-        self.entries[meta.filepath] = _photo_to_entry(meta)
-        self._dirty = True
+    def update(self, meta: PhotoMeta, f=None) -> None:
+        """Add or update a scan result in the index.
+
+        A rescan that produces exactly the stored scan fields leaves the entry
+        (including its match cache) untouched and doesn't dirty the index.
+
+        Safe to call from scan worker threads: the file I/O for the entry
+        (stat, content hash) runs unlocked, only the bookkeeping is locked.
+        Pass the handle the scan read from as ``f`` to hash through it
+        rather than opening the file a second time.
+        """
+        entry = _photo_to_entry(meta, self._stat_cache.pop(meta.filepath, None), f)
+        with self._lock:
+            old = self.entries.get(meta.filepath)
+            if old is not None and all(old.get(k) == v for k, v in entry.items()):
+                return
+            old_date = _entry_source_date(old)
+            new_date = _entry_source_date(entry)
+            if old_date != new_date:
+                self._dirty_dates.update(d for d in (old_date, new_date) if d)
+            self.entries[meta.filepath] = entry
+            self._changed.add(meta.filepath)
+            self._dirty = True
 
     def prune(self, valid_paths: set) -> int:
         """Remove entries for files that no longer exist. Returns count removed."""
-        stale = [p for p in self.entries if p not in valid_paths]
+        entries = self.entries
+        stale = entries.keys() - valid_paths
+        if not stale:
+            return 0
+
         for p in stale:
-            del self.entries[p]
-        if stale:
-            self._dirty = True
-            logger.info(f"Pruned {len(stale)} stale entries from index")
+            date = _entry_source_date(entries[p])
+            if date:
+                self._dirty_dates.add(date)
+        # Rebuild in one pass rather than popping entry by entry
+        self.entries = {p: e for p, e in entries.items() if p not in stale}
+        self._changed |= stale
+        self._dirty = True
+        logger.info(f"Pruned {len(stale)} stale entries from index")
         return len(stale)
 
     def clear(self) -> None:
         """Clear all entries and match threshold."""
         self.entries = {}
+        self._stat_cache = {}
+        self.source_fingerprints = {}
         self._match_threshold_minutes = None
+        self._dirty_dates = set()
+        self._fingerprints_complete = True
+        self._compact = True
         self._dirty = True
 
+    def refresh_source_fingerprints(self) -> int:
+        """Recompute source fingerprints for dates whose GPS sources changed.
+
+        Only dates touched by update() or prune() since the last refresh are
+        rehashed; a full rebuild happens once for indexes loaded without
+        persisted fingerprints. Returns the number of dates recomputed.
+        """
+        if self._fingerprints_complete and not self._dirty_dates:
+            return 0
+
+        full = not self._fingerprints_complete
+        dirty = self._dirty_dates
+
+        # One global sort by (date, path) groups each date's sources in
+        # order, so no per-date bucket lists or per-date sorts are needed.
+        sources = []
+        for path, entry in self.entries.items():
+            date = _entry_source_date(entry)
+            if date and (full or date in dirty):
+                sources.append((date, path))
+        sources.sort()
+
+        if full:
+            fingerprints = {}
+        else:
+            fingerprints = {d: fp for d, fp in self.source_fingerprints.items() if d not in dirty}
+        recomputed = 0
+        for date, group in itertools.groupby(sources, key=itemgetter(0)):
+            fingerprints[date] = _fingerprint_paths(path for _, path in group)
+            recomputed += 1
+
+        if fingerprints != self.source_fingerprints:
+            old = self.source_fingerprints
+            self._changed_dates.update(d for d in old.keys() | fingerprints.keys() if old.get(d) != fingerprints.get(d))
+            self.source_fingerprints = fingerprints
+            self._dirty = True
+
+        self._dirty_dates = set()
+        self._fingerprints_complete = True
+        logger.debug(f"Source fingerprints: {recomputed} dates recomputed")
+        return recomputed
+
     # ── Match cache methods ──────────────────────────────────────────────
 
     def update_match_result(self, filepath: str, status: str, source_fingerprint: str = None) -> None:
@@ -245,12 +561,43 @@ class ScanIndex:
             status: "matched" or "no_match".
             source_fingerprint: Hash of GPS sources available for this target's date.
         """
-        if filepath not in self.entries:
+        entry = self.entries.get(filepath)
+        if entry is None:
+            return
+        if entry.get("match_status") == status and entry.get("match_source_fp") == source_fingerprint:
             return
-        self.entries[filepath]["match_status"] = status
-        self.entries[filepath]["match_source_fp"] = source_fingerprint
+        entry["match_status"] = status
+        entry["match_source_fp"] = source_fingerprint
+        self._changed.add(filepath)
         self._dirty = True
 
+    def update_match_results_bulk(self, results: Iterable[tuple]) -> int:
+        """Set match cache fields for many entries at once.
+
+        Args:
+            results: Iterable of (filepath, status, source_fingerprint) tuples.
+                Paths not present in the index are skipped.
+
+        Returns:
+            Number of entries whose match cache changed. The index is only
+            marked dirty when this is non-zero.
+        """
+        entries = self.entries
+        updated = 0
+        for filepath, status, source_fingerprint in results:
+            entry = entries.get(filepath)
+            if entry is None:
+                continue
+            if entry.get("match_status") == status and entry.get("match_source_fp") == source_fingerprint:
+                continue
+            entry["match_status"] = status
+            entry["match_source_fp"] = source_fingerprint
+            self._changed.add(filepath)
+            updated += 1
+        if updated:
+            self._dirty = True
+        return updated
+
     def get_match_result(self, filepath: str) -> tuple:
         """Retrieve cached match result for a photo.
 
@@ -278,6 +625,7 @@ class ScanIndex:
             entry.pop("match_status", None)
             entry.pop("match_source_fp", None)
         self._match_threshold_minutes = current_minutes
+        self._compact = True
         self._dirty = True
         return False
 
@@ -7,9 +7,10 @@ Takes a single list of photos, auto-splits them into:
 
 Algorithm:
   1. Group GPS-source photos by calendar date (YYYY-MM-DD)
-  2. For each GPS-target photo:
+  2. Group GPS-target photos by date; for each target:
      a. Find GPS-source photos from the same date
-     b. Select the one with the closest timestamp
+     b. Select the one with the closest timestamp (binary search over the
+        date's sorted source times)
      c. If within the configured threshold → match
   3. Compute confidence score: 100 * (1 - time_delta / threshold)
 """
@@ -17,18 +18,22 @@ Algorithm:
 from __future__ import annotations
 
 import logging
+from bisect import bisect_left
 from collections import defaultdict
 from dataclasses import dataclass
-from datetime import timedelta
+from datetime import datetime, timedelta
+from operator import itemgetter
 from typing import Optional
 
-from . import PROJECT_NAME
+from . import DATACLASS_SLOTS, PROJECT_NAME
 from .scanner import PhotoMeta
 
 logger = logging.getLogger(f"{PROJECT_NAME.lower()}.matcher")
 
+_EPOCH = datetime(1970, 1, 1)
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class MatchResult:
     """A match between a target photo and a GPS-source photo."""
 
@@ -64,7 +69,7 @@ class MatchResult:
             return f"{sign}{seconds}s"
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class MatchStats:
     """Statistics about the matching process."""
 
@@ -101,6 +106,15 @@ class MatchStats:
         return self.source_dates
 
 
+def _epoch_seconds(dt: datetime) -> float:
+    """Seconds since 1970-01-01 for a naive EXIF datetime.
+
+    Unlike ``datetime.timestamp()`` this does not apply the local timezone,
+    so DST transitions can't shift the distance between two photos.
+    """
+    return (dt - _EPOCH).total_seconds()
+
+
 def match_photos(
     photos: list[PhotoMeta] = None,
     *,
@@ -151,77 +165,116 @@ def match_photos(
 
     stats.sources = len(sources)
 
-    # Step 1: Index GPS-source photos by date
-    source_by_date: dict[str, list[PhotoMeta]] = defaultdict(list)
+    # Step 1: Index GPS-source photos by date as (epoch seconds, photo)
+    # pairs, so each source's time is converted exactly once
+    source_by_date: dict[str, list[tuple[float, PhotoMeta]]] = defaultdict(list)
     for sp in sources:
         if sp.has_gps and sp.datetime_original:
             date_key = sp.date_key
             if date_key:
-                source_by_date[date_key].append(sp)
+                source_by_date[date_key].append((_epoch_seconds(sp.datetime_original), sp))
 
     stats.source_dates = len(source_by_date)
 
-    # Sort source photos within each date by timestamp
-    for date_key in source_by_date:
-        source_by_date[date_key].sort(key=lambda p: p.datetime_original)
+    # Sort each date by time (itemgetter runs in C; the sort is stable, so
+    # equal times keep input order) and split into parallel lists: seconds
+    # for binary search, photos for the result. From here on the index is
+    # read-only, so use a plain dict (no insert-on-miss)
+    by_seconds = itemgetter(0)
+    sorted_by_date = {}
+    for date_key, pairs in source_by_date.items():
+        pairs.sort(key=by_seconds)
+        times, date_sources = zip(*pairs)
+        sorted_by_date[date_key] = (times, date_sources)
+    get_sources = sorted_by_date.get
 
     logger.info(f"GPS source index: {stats.sources} photos across {stats.source_dates} dates")
 
-    # Step 2: Match each target photo
-    matches: list[MatchResult] = []
-    unmatched: list[PhotoMeta] = []
-
-    for tp in targets:
+    # Step 2: Bucket target photos by date so each date's sources are looked
+    # up once, not once per target. Each target keeps its input position so
+    # results can be put back in input order (preview and report rows)
+    matched: list[tuple[int, MatchResult]] = []
+    unmatched_at: list[tuple[int, PhotoMeta]] = []
+    max_seconds = max_time_delta.total_seconds()
+    confidence_sum = 0.0
+    delta_sum = 0.0  # absolute seconds
+
+    targets_by_date: dict[str, list[tuple[int, PhotoMeta]]] = defaultdict(list)
+    for pos, tp in enumerate(targets):
         # Skip photos without datetime
         if not tp.datetime_original:
             stats.without_datetime += 1
-            unmatched.append(tp)
+            unmatched_at.append((pos, tp))
             continue
+        targets_by_date[tp.date_key].append((pos, tp))
 
-        stats.targets += 1
-        date_key = tp.date_key
+    # Step 3: Match each date's targets against that date's sources
+    for date_key, date_targets in targets_by_date.items():
+        stats.targets += len(date_targets)
 
-        # Find source photos from the same date
-        if date_key not in source_by_date:
-            stats.unmatched += 1
-            unmatched.append(tp)
+        indexed = get_sources(date_key)
+        if indexed is None:
+            stats.unmatched += len(date_targets)
+            unmatched_at.extend(date_targets)
             continue
 
-        # Find closest source photo by timestamp
-        best_match: Optional[PhotoMeta] = None
-        best_delta: Optional[timedelta] = None
-
-        for sp in source_by_date[date_key]:
-            delta = abs(tp.datetime_original - sp.datetime_original)
-            if delta <= max_time_delta:
-                if best_delta is None or delta < best_delta:
-                    best_match = sp
-                    best_delta = delta
-
-        if best_match and best_delta is not None:
-            max_seconds = max_time_delta.total_seconds()
-            confidence = 100.0 if max_seconds == 0 else 100.0 * (1.0 - best_delta.total_seconds() / max_seconds)
-            confidence = max(0.0, min(100.0, confidence))
-
-            # Signed delta: positive = target after source, negative = target before
-            signed_delta = tp.datetime_original - best_match.datetime_original
-
-            match = MatchResult(
-                target=tp,
-                source=best_match,
-                time_delta=signed_delta,
-                confidence=confidence,
-            )
-            matches.append(match)
-            stats.matched += 1
-        else:
-            stats.unmatched += 1
-            unmatched.append(tp)
-
-    # Compute averages
+        times, date_sources = indexed
+        n_times = len(times)
+
+        for pos, tp in date_targets:
+            tp_dt = tp.datetime_original
+
+            # Closest source is one of the two neighbours of the insertion
+            # point. On equal distance (or equal timestamps) the earliest
+            # source wins.
+            t = _epoch_seconds(tp_dt)
+            best_match: Optional[PhotoMeta] = None
+            best_delta = 0.0  # seconds
+
+            i = bisect_left(times, t)
+            if i > 0:
+                before = times[i - 1]
+                best_delta = t - before
+                best_match = date_sources[bisect_left(times, before, 0, i)]
+            if i < n_times and (best_match is None or times[i] - t < best_delta):
+                best_delta = times[i] - t
+                best_match = date_sources[i]
+            if best_delta > max_seconds:
+                best_match = None
+
+            if best_match is not None:
+                confidence = 100.0 if max_seconds == 0 else 100.0 * (1.0 - best_delta / max_seconds)
+                confidence = max(0.0, min(100.0, confidence))
+
+                # Signed delta: positive = target after source, negative = target before
+                signed_delta = tp_dt - best_match.datetime_original
+
+                match = MatchResult(
+                    target=tp,
+                    source=best_match,
+                    time_delta=signed_delta,
+                    confidence=confidence,
+                )
+                matched.append((pos, match))
+                stats.matched += 1
+                confidence_sum += confidence
+                delta_sum += best_delta
+            else:
+                stats.unmatched += 1
+                unmatched_at.append((pos, tp))
+
+    # Back to input order: each date group is already ascending, so the
+    # sort only merges runs
+    by_pos = itemgetter(0)
+    matched.sort(key=by_pos)
+    unmatched_at.sort(key=by_pos)
+    matches = [m for _, m in matched]
+    unmatched = [tp for _, tp in unmatched_at]
+
+    # Averages from sums accumulated in the match loop
     if matches:
-        stats.avg_confidence = sum(m.confidence for m in matches) / len(matches)
-        stats.avg_time_delta_min = sum(abs(m.time_delta.total_seconds()) / 60 for m in matches) / len(matches)
+        stats.avg_confidence = confidence_sum / len(matches)
+        stats.avg_time_delta_min = delta_sum / (60 * len(matches))
 
     logger.info(
         f"Matching complete: {stats.matched} matched, {stats.unmatched} unmatched "
@@ -4,13 +4,14 @@ parallel.py — Multithreaded photo scanning with index integration.
 Combines the scan index (cache) with concurrent.futures ThreadPoolExecutor
 to maximize scan throughput:
   1. Walk directories, collect file paths
-  2. Check index for cache hits (skip EXIF read)
+  2. Check index for cache hits (skip EXIF read); files are stat'ed in parallel
   3. Fan out cache misses to thread pool for parallel EXIF reads
-  4. Merge results and update index
+  4. Merge results, update index and refresh per-date source fingerprints
 
 Thread safety:
   - scan_photo() is thread-safe (reads file, returns new object)
-  - Index updates happen on main thread after pool completes
+  - Workers record their own results via ScanIndex.update(), which locks
+    around the index bookkeeping (the entry's stat/hash I/O runs unlocked)
   - Progress counter uses threading.Lock for accurate reporting
 """
 
@@ -20,7 +21,7 @@ import logging
 import os
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from . import PROJECT_NAME
@@ -35,13 +36,14 @@ def _collect_file_paths(
     extensions: set,
     recursive: bool = True,
     exclude_patterns: list = None,
+    workers: int = 1,
 ) -> list:
     """Walk directories and collect all photo file paths (no EXIF reading).
 
     Delegates to scanner.collect_photo_paths — kept as a thin wrapper for
     backward compatibility with tests that import this name.
     """
-    return collect_photo_paths(directories, extensions, recursive, exclude_patterns)
+    return collect_photo_paths(directories, extensions, recursive, exclude_patterns, workers)
 
 
 class ScanProgress:
@@ -66,11 +68,13 @@ class ScanProgress:
                     f"({self._cache_hits} cached, {self._errors} errors)"
                 )
 
-    def tick_cached(self) -> None:
+    def tick_cached(self, count: int = 1) -> None:
+        """Record *count* cache hits under a single lock acquisition."""
         with self._lock:
-            self._scanned += 1
-            self._cache_hits += 1
-            if self._scanned % self.report_every == 0:
+            before = self._scanned
+            self._scanned += count
+            self._cache_hits += count
+            if self._scanned // self.report_every != before // self.report_every:
                 logger.info(
                     f"  Progress: {self._scanned}/{self.total} scanned "
                     f"({self._cache_hits} cached, {self._errors} errors)"
@@ -118,7 +122,7 @@ def scan_with_index(
 
     # Step 1: Collect all file paths (fast — just filesystem walk)
     logger.info(f"Collecting file paths from {len(directories)} directories...")
-    all_paths = _collect_file_paths(directories, extensions, recursive, exclude_patterns)
+    all_paths = _collect_file_paths(directories, extensions, recursive, exclude_patterns, workers)
     logger.info(f"Found {len(all_paths)} photo files in {time.time() - t0:.1f}s")
 
     if not all_paths:
@@ -130,13 +134,9 @@ def scan_with_index(
     progress = ScanProgress(len(all_paths))
 
     if index is not None:
-        for filepath in all_paths:
-            cached = index.lookup(filepath)
-            if cached is not None:
-                results.append(cached)
-                progress.tick_cached()
-            else:
-                to_scan.append(filepath)
+        # Stat calls are fanned out across the same number of threads
+        results, to_scan = index.lookup_many(all_paths, workers)
+        progress.tick_cached(len(results))
 
         logger.info(f"Index: {progress.cache_hits} cache hits, {len(to_scan)} need scanning")
     else:
@@ -149,37 +149,45 @@ def scan_with_index(
 
         scanned_results = []  # type: list[PhotoMeta]
 
-        with ThreadPoolExecutor(max_workers=actual_workers) as pool:
-            futures = {pool.submit(scan_photo, fp): fp for fp in to_scan}
-
-            for future in as_completed(futures):
-                filepath = futures[future]
+        def scan_and_index(filepath: str) -> PhotoMeta:
+            try:
+                if index is None:
+                    return scan_photo(filepath)
                 try:
-                    meta = future.result()
-                    scanned_results.append(meta)
-                    progress.tick(error=bool(meta.scan_error))
-
-                    # Update index on main thread (futures resolve here)
-                    if index is not None:
-                        index.update(meta)
-
-                except Exception as e:
-                    logger.error(f"Thread scan failed for {filepath}: {e}")
-                    meta = PhotoMeta(
-                        filepath=filepath,
-                        filename=os.path.basename(filepath),
-                        extension=os.path.splitext(filepath)[1].lower(),
-                        scan_error=str(e),
-                    )
-                    scanned_results.append(meta)
-                    progress.tick(error=True)
+                    f = open(filepath, "rb")
+                except OSError:
+                    meta = scan_photo(filepath)  # records the read error
+                    index.update(meta)
+                    return meta
+                # One open serves the EXIF scan and the index's content hash
+                with f:
+                    meta = scan_photo(filepath, f)
+                    index.update(meta, f)
+            except Exception as e:
+                logger.error(f"Thread scan failed for {filepath}: {e}")
+                meta = PhotoMeta(
+                    filepath=filepath,
+                    filename=os.path.basename(filepath),
+                    extension=os.path.splitext(filepath)[1].lower(),
+                    scan_error=str(e),
+                )
+            return meta
+
+        # pool.map rather than submit + as_completed: no {future: path} dict
+        # and no per-future completion waiter, and results keep walk order
+        with ThreadPoolExecutor(max_workers=actual_workers) as pool:
+            for meta in pool.map(scan_and_index, to_scan):
+                scanned_results.append(meta)
+                progress.tick(error=bool(meta.scan_error))
 
         results.extend(scanned_results)
 
-    # Step 4: Prune stale index entries
+    # Step 4: Prune stale index entries, then rehash only the dates whose
+    # GPS sources changed during this scan
     if index is not None:
         valid_paths = set(all_paths)
         index.prune(valid_paths)
+        index.refresh_source_fingerprints()
 
     scan_time = time.time() - t0
     logger.info(
@@ -9,23 +9,32 @@ No camera/mobile distinction needed — directories can be mixed.
 
 Supported formats:
   JPG, JPEG, ARW, NEF, CR2, CR3, DNG, ORF, RAF, RW2, HEIC, HEIF, PNG
+
+JPEG, PNG and TIFF-based RAW files are read with a small built-in IFD reader,
+as is the EXIF block pillow-heif extracts from HEIC/HEIF; other formats (and
+anything it can't parse) go through exifread.
 """
 
 from __future__ import annotations
 
 import fnmatch
+import inspect
 import logging
+import mmap
 import os
+import re
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
 import exifread
 from PIL import Image
-from PIL.ExifTags import Base as ExifBase
 from pillow_heif import register_heif_opener
 
-from . import MARKER_PREFIX, PROJECT_NAME, PROJECT_TAG
+from . import DATACLASS_SLOTS, MARKER_PREFIX, PROJECT_NAME, PROJECT_TAG
 
 logger = logging.getLogger(f"{PROJECT_NAME.lower()}.scanner")
 
@@ -34,27 +43,29 @@ logger = logging.getLogger(f"{PROJECT_NAME.lower()}.scanner")
 register_heif_opener()
 
 # All supported photo extensions (unified — no camera/mobile split)
-PHOTO_EXTS = {
-    ".jpg",
-    ".jpeg",
-    ".arw",
-    ".nef",
-    ".cr2",
-    ".cr3",
-    ".dng",
-    ".orf",
-    ".raf",
-    ".rw2",  # RAW
-    ".heic",
-    ".heif",
-    ".png",
-}
+PHOTO_EXTS = frozenset(
+    {
+        ".jpg",
+        ".jpeg",
+        ".arw",
+        ".nef",
+        ".cr2",
+        ".cr3",
+        ".dng",
+        ".orf",
+        ".raf",
+        ".rw2",  # RAW
+        ".heic",
+        ".heif",
+        ".png",
+    }
+)
 
 GEOSNAG_TAG = PROJECT_TAG
 GEOSNAG_MARKER_PREFIX = MARKER_PREFIX
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class PhotoMeta:
     """Metadata extracted from a photo file."""
 
@@ -78,28 +89,56 @@ class PhotoMeta:
             return self.datetime_original.strftime("%Y-%m-%d")
         return None
 
+    @property
+    def datetime_iso(self) -> str:
+        """ISO 8601 capture time for reports, or "" when unknown."""
+        if self.datetime_original:
+            return self.datetime_original.isoformat()
+        return ""
+
+    @property
+    def device_label(self) -> str:
+        """Human-readable "make model" label, or "" when both are unknown."""
+        return f"{self.camera_make or ''} {self.camera_model or ''}".strip()
+
 
 def _gps_dms_to_decimal(dms_value, ref) -> Optional[float]:
     """Convert EXIF GPS DMS (degrees/minutes/seconds) to decimal degrees."""
     try:
-        values = dms_value.values
-        d = float(values[0].num) / float(values[0].den)
-        m = float(values[1].num) / float(values[1].den)
-        s = float(values[2].num) / float(values[2].den)
+        d, m, s = dms_value.values[:3]
+        # int / int is true division straight to float (exact for 32-bit
+        # rationals), no float() round-trips needed
+        d = d.num / d.den
+        m = m.num / m.den
+        s = s.num / s.den
         decimal = d + m / 60.0 + s / 3600.0
         if ref in ("S", "W"):
             decimal = -decimal
         return decimal
-    except (AttributeError, IndexError, ZeroDivisionError, TypeError) as e:
+    except (AttributeError, IndexError, ZeroDivisionError, TypeError, ValueError) as e:
         logger.debug(f"GPS conversion error: {e}")
         return None
 
 
+_DT_FORMATS = ("%Y:%m:%d %H:%M:%S", "%Y-%m-%d %H:%M:%S", "%Y:%m:%d %H:%M:%S.%f")
+
+
 def _parse_exif_datetime(dt_string: str) -> Optional[datetime]:
     """Parse EXIF datetime string to Python datetime."""
-    for fmt in ("%Y:%m:%d %H:%M:%S", "%Y-%m-%d %H:%M:%S", "%Y:%m:%d %H:%M:%S.%f"):
+    s = str(dt_string).strip()
+
+    # Fast path for the canonical "YYYY:MM:DD HH:MM:SS" (or "-" dated) form;
+    # strptime re-interprets its format on every call and dominates otherwise.
+    if len(s) == 19 and s[4] == s[7] and s[4] in ":-" and s[10] == " " and s[13] == s[16] == ":":
+        if (s[:4] + s[5:7] + s[8:10] + s[11:13] + s[14:16] + s[17:]).isdigit():
+            try:
+                return datetime(int(s[:4]), int(s[5:7]), int(s[8:10]), int(s[11:13]), int(s[14:16]), int(s[17:]))
+            except ValueError:  # e.g. the "0000:00:00 00:00:00" placeholder
+                return None
+
+    for fmt in _DT_FORMATS:
         try:
-            return datetime.strptime(str(dt_string).strip(), fmt)
+            return datetime.strptime(s, fmt)
         except ValueError:
             continue
     return None
@@ -114,16 +153,21 @@ def _check_geosnag_tag_exifread(tags: dict) -> bool:
     return False
 
 
+# pyexiv2 is not thread-safe, and this runs on the scan worker threads.
+_PYEXIV2_LOCK = threading.Lock()
+
+
 def _check_geosnag_tag_pyexiv2(filepath: str) -> bool:
     """Check if GeoSnag processed tag is present via pyexiv2 (more reliable)."""
     try:
         import pyexiv2
 
-        img = pyexiv2.Image(filepath)
-        try:
-            exif = img.read_exif()
-        finally:
-            img.close()
+        with _PYEXIV2_LOCK:
+            img = pyexiv2.Image(filepath)
+            try:
+                exif = img.read_exif()
+            finally:
+                img.close()
         val = exif.get(GEOSNAG_TAG, "")
         return val.startswith(GEOSNAG_MARKER_PREFIX)
     except Exception:
@@ -131,8 +175,22 @@ def _check_geosnag_tag_pyexiv2(filepath: str) -> bool:
     return False
 
 
-def _scan_with_exifread(filepath: str) -> dict:
-    """Read EXIF using exifread library (works for JPG, NEF, ARW, CR2, DNG, etc.)."""
+# details=False skips MakerNotes. Newer exifread releases also extract the
+# embedded thumbnail regardless of details unless told not to; unused here.
+_EXIFREAD_OPTIONS = {"details": False}
+if "extract_thumbnail" in inspect.signature(exifread.process_file).parameters:
+    _EXIFREAD_OPTIONS["extract_thumbnail"] = False
+
+
+def _scan_with_exifread(filepath: str, f=None) -> dict:
+    """Read EXIF using exifread library (works for JPG, NEF, ARW, CR2, DNG, etc.).
+
+    ``f`` is an optional binary file already open on ``filepath``.
+    """
+    if f is None:
+        with open(filepath, "rb") as f:
+            return _scan_with_exifread(filepath, f)
+
     result = {
         "datetime_original": None,
         "has_gps": False,
@@ -145,8 +203,8 @@ def _scan_with_exifread(filepath: str) -> dict:
         "scan_error": None,
     }
 
-    with open(filepath, "rb") as f:
-        tags = exifread.process_file(f, details=False)
+    f.seek(0)
+    tags = exifread.process_file(f, **_EXIFREAD_OPTIONS)
 
     if not tags:
         return result
@@ -194,16 +252,248 @@ def _scan_with_exifread(filepath: str) -> dict:
             except (AttributeError, IndexError, ZeroDivisionError):
                 pass
 
-    # GeoSnag processed check — try exifread first, fallback to pyexiv2
-    result["geosnag_processed"] = _check_geosnag_tag_exifread(tags)
-    if not result["geosnag_processed"]:
+    # GeoSnag processed check. A Software tag exifread can see is the one the
+    # writer stamps, so it is authoritative; only when exifread found none
+    # (a layout it reads partially) is the file re-parsed with pyexiv2.
+    if "Image Software" in tags:
+        result["geosnag_processed"] = _check_geosnag_tag_exifread(tags)
+    else:
         result["geosnag_processed"] = _check_geosnag_tag_pyexiv2(filepath)
 
     return result
 
 
-def _scan_heic(filepath: str) -> dict:
-    """Read EXIF from HEIC/HEIF using pillow-heif."""
+# ── Direct TIFF/EXIF reader ─────────────────────────────────────────────
+#
+# exifread decodes every tag of every IFD into Python objects. We need a
+# dozen tags, so for JPEG, PNG (eXIf chunk) and TIFF-based RAW files (NEF,
+# ARW, CR2, DNG, ORF, RW2) the IFD chains are walked directly with struct.
+# Anything this reader doesn't recognise (CR3, RAF, malformed files) returns
+# None and is handled by exifread as before.
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_TIFF_MAGIC = {42, 0x4F52, 0x5352, 0x55}  # TIFF, Olympus ORF (IIRO / IIRS), Panasonic RW2
+_TYPE_SIZES = {1: 1, 2: 1, 3: 2, 4: 4, 5: 8, 6: 1, 7: 1, 8: 2, 9: 4, 10: 8, 11: 4, 12: 8, 13: 4}
+
+# IFD0: Make, Model, Software, DateTime, DateTimeOriginal, ExifIFD, GPS IFD
+_IFD0_TAGS = frozenset({0x010F, 0x0110, 0x0131, 0x0132, 0x9003, 0x8769, 0x8825})
+_EXIF_TAGS = frozenset({0x9003, 0x9004})  # DateTimeOriginal, DateTimeDigitized
+_GPS_TAGS = frozenset({0x0001, 0x0002, 0x0003, 0x0004, 0x0005, 0x0006})
+
+
+def _find_tiff_header(buf) -> Optional[int]:
+    """Offset of the TIFF header in a JPEG (APP1 "Exif") or TIFF-based file."""
+    head = buf[:4]
+    if head[:2] in (b"II", b"MM"):
+        return 0
+    if head[:2] != b"\xff\xd8":
+        return None
+
+    # Walk JPEG marker segments up to start-of-scan
+    pos = 2
+    size = len(buf)
+    while pos + 4 <= size:
+        if buf[pos] != 0xFF:
+            return None
+        marker = buf[pos + 1]
+        if marker == 0xFF:  # fill byte
+            pos += 1
+            continue
+        if marker in (0xD9, 0xDA):  # EOI / SOS — no EXIF before image data
+            return None
+        length = (buf[pos + 2] << 8) | buf[pos + 3]
+        if marker == 0xE1 and buf[pos + 4 : pos + 10] == b"Exif\x00\x00":
+            return pos + 10
+        pos += 2 + length
+    return None
+
+
+def _find_png_exif(buf) -> Optional[int]:
+    """Offset of the eXIf chunk data in a PNG, or None if it has none.
+
+    Only the 8-byte chunk headers are read, so image data is never paged in.
+    """
+    pos = len(_PNG_SIGNATURE)
+    size = len(buf)
+    while pos + 8 <= size:
+        length, chunk = struct.unpack_from(">I4s", buf, pos)
+        if chunk == b"eXIf":
+            return pos + 8
+        if chunk == b"IEND":
+            break
+        pos += 12 + length  # length + type + data + CRC
+    return None
+
+
+def _read_ifd(buf, base: int, offset: int, endian: str, wanted: frozenset) -> dict:
+    """Return {tag: value} for the wanted tags of the IFD at base+offset.
+
+    Values are decoded per type: ASCII → str (up to the first NUL), integer
+    types → tuple of ints, (S)RATIONAL → tuple of (num, den) pairs.
+    """
+    start = base + offset
+    size = len(buf)
+    if offset <= 0 or start + 2 > size:
+        return {}
+    (count,) = struct.unpack_from(endian + "H", buf, start)
+    entry = struct.Struct(endian + "HHI")
+    long_ = struct.Struct(endian + "I")
+    out = {}
+    for i in range(count):
+        pos = start + 2 + 12 * i
+        if pos + 12 > size:
+            break
+        tag, typ, n = entry.unpack_from(buf, pos)
+        if tag not in wanted:
+            continue
+        width = _TYPE_SIZES.get(typ)
+        if width is None:
+            continue
+        nbytes = width * n
+        vpos = pos + 8 if nbytes <= 4 else base + long_.unpack_from(buf, pos + 8)[0]
+        if vpos + nbytes > size:
+            continue
+        if typ == 2:
+            raw = bytes(buf[vpos : vpos + n]).split(b"\x00", 1)[0]
+            try:
+                out[tag] = raw.decode("utf-8")
+            except UnicodeDecodeError:
+                out[tag] = raw.decode("latin-1")
+        elif typ in (5, 10):
+            fmt = endian + ("I" if typ == 5 else "i") * (2 * n)
+            vals = struct.unpack_from(fmt, buf, vpos)
+            out[tag] = tuple(zip(vals[0::2], vals[1::2]))
+        elif typ in (1, 7, 6):
+            out[tag] = tuple(buf[vpos : vpos + n])
+        elif typ in (3, 8):
+            out[tag] = struct.unpack_from(endian + ("H" if typ == 3 else "h") * n, buf, vpos)
+        elif typ in (4, 9, 13):  # LONG, SLONG, IFD offset
+            out[tag] = struct.unpack_from(endian + ("i" if typ == 9 else "I") * n, buf, vpos)
+    return out
+
+
+def _rational_dms_to_decimal(dms, ref) -> Optional[float]:
+    """Convert (num, den) degree/minute/second triples to decimal degrees."""
+    try:
+        (dn, dd), (mn, md), (sn, sd) = dms[:3]
+        d = dn / dd
+        m = mn / md
+        s = sn / sd
+    except (IndexError, ZeroDivisionError, TypeError, ValueError) as e:
+        logger.debug(f"GPS conversion error: {e}")
+        return None
+    decimal = d + m / 60.0 + s / 3600.0
+    if ref in ("S", "W"):
+        decimal = -decimal
+    return decimal
+
+
+def _parse_tiff_tags(buf) -> Optional[dict]:
+    """Extract the scan fields from a JPEG/TIFF/PNG buffer, or None if not one."""
+    result = {
+        "datetime_original": None,
+        "has_gps": False,
+        "gps_latitude": None,
+        "gps_longitude": None,
+        "gps_altitude": None,
+        "camera_make": None,
+        "camera_model": None,
+        "geosnag_processed": False,
+        "scan_error": None,
+    }
+
+    if buf[:8] == _PNG_SIGNATURE:
+        base = _find_png_exif(buf)
+        if base is None:
+            # exifread only looks at eXIf too — nothing more to find
+            return result
+    else:
+        base = _find_tiff_header(buf)
+    if base is None or base + 8 > len(buf):
+        return None
+    order = buf[base : base + 2]
+    if order == b"II":
+        endian = "<"
+    elif order == b"MM":
+        endian = ">"
+    else:
+        return None
+    magic, ifd0_offset = struct.unpack_from(endian + "HI", buf, base + 2)
+    if magic not in _TIFF_MAGIC:
+        return None
+
+    ifd0 = _read_ifd(buf, base, ifd0_offset, endian, _IFD0_TAGS)
+    exif_ifd = _read_ifd(buf, base, ifd0[0x8769][0], endian, _EXIF_TAGS) if 0x8769 in ifd0 else {}
+    gps_ifd = _read_ifd(buf, base, ifd0[0x8825][0], endian, _GPS_TAGS) if 0x8825 in ifd0 else {}
+
+    if 0x010F in ifd0:
+        result["camera_make"] = ifd0[0x010F].strip()
+    if 0x0110 in ifd0:
+        result["camera_model"] = ifd0[0x0110].strip()
+
+    # Same priority as the exifread path: EXIF DateTimeOriginal,
+    # EXIF DateTimeDigitized, Image DateTime, Image DateTimeOriginal
+    for value in (exif_ifd.get(0x9003), exif_ifd.get(0x9004), ifd0.get(0x0132), ifd0.get(0x9003)):
+        if isinstance(value, str):
+            result["datetime_original"] = _parse_exif_datetime(value)
+            if result["datetime_original"]:
+                break
+
+    if 0x0002 in gps_ifd and 0x0004 in gps_ifd:
+        lat = _rational_dms_to_decimal(gps_ifd[0x0002], gps_ifd.get(0x0001, "N"))
+        lon = _rational_dms_to_decimal(gps_ifd[0x0004], gps_ifd.get(0x0003, "E"))
+        if lat is not None and lon is not None:
+            if -90 <= lat <= 90 and -180 <= lon <= 180:
+                result["has_gps"] = True
+                result["gps_latitude"] = lat
+                result["gps_longitude"] = lon
+
+        if 0x0006 in gps_ifd:
+            try:
+                num, den = gps_ifd[0x0006][0]
+                alt = float(num) / float(den)
+                alt_ref = gps_ifd.get(0x0005, (0,))
+                if alt_ref and alt_ref[0] == 1:
+                    alt = -alt
+                result["gps_altitude"] = alt
+            except (IndexError, TypeError, ValueError, ZeroDivisionError):
+                pass
+
+    software = ifd0.get(0x0131)
+    result["geosnag_processed"] = isinstance(software, str) and software.startswith(GEOSNAG_MARKER_PREFIX)
+    return result
+
+
+def _scan_tiff(filepath: str, f=None) -> Optional[dict]:
+    """Read EXIF from a JPEG, PNG or TIFF-based RAW without exifread.
+
+    Returns None for formats the direct reader doesn't handle, so the caller
+    can fall back to exifread. ``f`` is an optional binary file already open
+    on ``filepath``; its position is left untouched.
+    """
+    if f is None:
+        with open(filepath, "rb") as f:
+            return _scan_tiff(filepath, f)
+
+    try:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (ValueError, OSError):  # empty file, or a filesystem without mmap
+        return None
+    try:
+        result = _parse_tiff_tags(buf)
+    except struct.error:
+        result = None
+    finally:
+        buf.close()
+    return result
+
+
+def _scan_heic(filepath: str, f=None) -> dict:
+    """Read EXIF from HEIC/HEIF.
+
+    pillow-heif only locates the EXIF item (no image decode); its TIFF
+    payload is parsed by the same direct IFD reader as JPEG and RAW files.
+    """
     result = {
         "datetime_original": None,
         "has_gps": False,
@@ -217,70 +507,15 @@ def _scan_heic(filepath: str) -> dict:
     }
 
     try:
-        with Image.open(filepath) as img:
-            exif = img.getexif()
-
-            if not exif:
-                return result
-
-            # Camera info
-            if ExifBase.Make in exif:
-                result["camera_make"] = str(exif[ExifBase.Make]).strip()
-            if ExifBase.Model in exif:
-                result["camera_model"] = str(exif[ExifBase.Model]).strip()
-
-            # DateTime
-            for tag_id in [ExifBase.DateTimeOriginal, ExifBase.DateTimeDigitized, ExifBase.DateTime]:
-                if tag_id in exif:
-                    result["datetime_original"] = _parse_exif_datetime(str(exif[tag_id]))
-                    if result["datetime_original"]:
-                        break
-                # Also check IFD sub-dictionaries
-                ifd = exif.get_ifd(0x8769)  # Exif IFD
-                if ifd and tag_id in ifd:
-                    result["datetime_original"] = _parse_exif_datetime(str(ifd[tag_id]))
-                    if result["datetime_original"]:
-                        break
-
-            # GPS IFD
-            gps_ifd = exif.get_ifd(0x8825)  # GPS IFD
-            if gps_ifd:
-                lat_data = gps_ifd.get(2)  # GPSLatitude
-                lat_ref = gps_ifd.get(1, "N")  # GPSLatitudeRef
-                lon_data = gps_ifd.get(4)  # GPSLongitude
-                lon_ref = gps_ifd.get(3, "E")  # GPSLongitudeRef
-
-                if lat_data and lon_data:
-                    try:
-                        lat = float(lat_data[0]) + float(lat_data[1]) / 60 + float(lat_data[2]) / 3600
-                        lon = float(lon_data[0]) + float(lon_data[1]) / 60 + float(lon_data[2]) / 3600
-                        if lat_ref == "S":
-                            lat = -lat
-                        if lon_ref == "W":
-                            lon = -lon
-                        if -90 <= lat <= 90 and -180 <= lon <= 180:
-                            result["has_gps"] = True
-                            result["gps_latitude"] = lat
-                            result["gps_longitude"] = lon
-                    except (TypeError, ValueError, IndexError):
-                        pass
-
-                # Altitude
-                alt_data = gps_ifd.get(6)  # GPSAltitude
-                if alt_data is not None:
-                    try:
-                        alt = float(alt_data)
-                        alt_ref = gps_ifd.get(5, 0)
-                        if alt_ref == 1:
-                            alt = -alt
-                        result["gps_altitude"] = alt
-                    except (TypeError, ValueError) as e:
-                        logger.debug(f"HEIC altitude conversion error for {filepath}: {e}")
-
-            # Software tag (IFD0, 0x0131) for GeoSnag processed marker
-            software = exif.get(0x0131, "")  # 0x0131 = Software
-            if str(software).startswith(GEOSNAG_MARKER_PREFIX):
-                result["geosnag_processed"] = True
+        with Image.open(f if f is not None else filepath) as img:
+            raw = img.info.get("exif")
+        if not raw:
+            return result
+        if raw.startswith(b"Exif\x00\x00"):
+            raw = raw[6:]
+        parsed = _parse_tiff_tags(raw)
+        if parsed is not None:
+            result = parsed
 
     except Exception as e:
         logger.debug(f"HEIC scan error for {filepath}: {e}")
@@ -289,10 +524,15 @@ def _scan_heic(filepath: str) -> dict:
     return result
 
 
-def scan_photo(filepath: str) -> PhotoMeta:
-    """Scan a single photo file and return its metadata."""
+def scan_photo(filepath: str, f=None) -> PhotoMeta:
+    """Scan a single photo file and return its metadata.
+
+    ``f`` is an already-open binary handle for the file (e.g. one the
+    caller also hashes); when omitted the file is opened here.
+    """
     filename = os.path.basename(filepath)
-    ext = os.path.splitext(filename)[1].lower()
+    dot = filename.rfind(".")
+    ext = filename[dot:].lower() if dot > 0 else ""
 
     meta = PhotoMeta(
         filepath=filepath,
@@ -302,19 +542,25 @@ def scan_photo(filepath: str) -> PhotoMeta:
 
     try:
         if ext in {".heic", ".heif"}:
-            data = _scan_heic(filepath)
+            data = _scan_heic(filepath, f)
+        elif f is not None:
+            data = _scan_tiff(filepath, f) or _scan_with_exifread(filepath, f)
         else:
-            data = _scan_with_exifread(filepath)
-
-        meta.datetime_original = data.get("datetime_original")
-        meta.has_gps = data.get("has_gps", False)
-        meta.gps_latitude = data.get("gps_latitude")
-        meta.gps_longitude = data.get("gps_longitude")
-        meta.gps_altitude = data.get("gps_altitude")
-        meta.camera_make = data.get("camera_make")
-        meta.camera_model = data.get("camera_model")
-        meta.geosnag_processed = data.get("geosnag_processed", False)
-        if data.get("scan_error"):
+            # One open() shared by the direct reader and the exifread
+            # fallback — each open is a server round-trip on NAS mounts.
+            with open(filepath, "rb") as f:
+                data = _scan_tiff(filepath, f) or _scan_with_exifread(filepath, f)
+
+        get = data.get
+        meta.datetime_original = get("datetime_original")
+        meta.has_gps = get("has_gps", False)
+        meta.gps_latitude = get("gps_latitude")
+        meta.gps_longitude = get("gps_longitude")
+        meta.gps_altitude = get("gps_altitude")
+        meta.camera_make = get("camera_make")
+        meta.camera_model = get("camera_model")
+        meta.geosnag_processed = get("geosnag_processed", False)
+        if get("scan_error"):
             meta.scan_error = data["scan_error"]
 
     except Exception as e:
@@ -324,11 +570,73 @@ def scan_photo(filepath: str) -> PhotoMeta:
     return meta
 
 
+def _list_dir(root: str) -> Optional[tuple]:
+    """One ``os.scandir`` pass: ``(filenames, subdir_paths)``, or None if unreadable.
+
+    File/directory classification comes from the cached ``d_type`` instead of
+    a ``stat`` per entry. Symlinked directories are neither files nor subdirs.
+    """
+    files = []
+    subdirs = []
+    try:
+        with os.scandir(root) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file():
+                        files.append(entry.name)
+                except OSError:
+                    continue
+    except OSError:
+        return None
+    return files, subdirs
+
+
+def _walk_files(directory: str, recursive: bool = True, workers: int = 1):
+    """Yield ``(root, filenames)`` for each directory under *directory*.
+
+    Same order and symlink handling as ``os.walk`` (top-down, symlinked
+    directories are listed but not entered). Unreadable directories are
+    skipped.
+
+    With ``workers > 1`` the tree is listed one level at a time, the level's
+    directories scandir'd concurrently (readdir on NAS mounts blocks on the
+    server with the GIL released), and then replayed in the same order.
+    """
+    if workers > 1 and recursive:
+        listings = {}
+        level = [directory]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while level:
+                next_level = []
+                for root, listing in zip(level, pool.map(_list_dir, level)):
+                    if listing is not None:
+                        listings[root] = listing
+                        next_level.extend(listing[1])
+                level = next_level
+        list_dir = listings.get
+    else:
+        list_dir = _list_dir
+
+    stack = [directory]
+    while stack:
+        root = stack.pop()
+        listing = list_dir(root)
+        if listing is None:
+            continue
+        files, subdirs = listing
+        yield root, files
+        if recursive:
+            stack.extend(reversed(subdirs))
+
+
 def collect_photo_paths(
     directories: list,
     extensions: set = None,
     recursive: bool = True,
     exclude_patterns: list = None,
+    workers: int = 1,
 ) -> list[str]:
     """Walk directories and collect all matching photo file paths.
 
@@ -340,12 +648,19 @@ def collect_photo_paths(
         extensions: File extensions to include (default: PHOTO_EXTS)
         recursive: Scan subdirectories
         exclude_patterns: Glob patterns for files to skip
+        workers: Threads listing directories concurrently (1 = serial walk)
 
     Returns:
         List of file paths (sorted within each directory)
     """
-    if extensions is None:
-        extensions = PHOTO_EXTS
+    extensions = PHOTO_EXTS if extensions is None else frozenset(extensions)
+
+    # One regex for all patterns instead of 2 × len(patterns) fnmatch calls
+    # per file. normcase mirrors what fnmatch.fnmatch does (no-op on POSIX).
+    exclude_match = None
+    if exclude_patterns:
+        normcase = os.path.normcase
+        exclude_match = re.compile("|".join(fnmatch.translate(normcase(p)) for p in exclude_patterns)).match
 
     paths = []
     for directory in directories:
@@ -353,28 +668,32 @@ def collect_photo_paths(
             logger.warning(f"Directory not found, skipping: {directory}")
             continue
 
-        walker = os.walk(directory) if recursive else [(directory, [], os.listdir(directory))]
-        for root, dirs, files in walker:
-            if not recursive:
-                files = [f for f in files if os.path.isfile(os.path.join(root, f))]
-            for fname in sorted(files):
-                ext = os.path.splitext(fname)[1].lower()
-                if ext not in extensions:
+        # Every walked path starts with this prefix, so the path relative to
+        # the scan root is a slice rather than an os.path.relpath call.
+        prefix_len = len(os.path.join(directory, ""))
+
+        for root, files in _walk_files(directory, recursive, workers):
+            found = []
+            for fname in files:
+                # Cheaper than os.path.splitext; dot <= 0 also skips
+                # extension-less names and dotfiles such as ".jpg".
+                dot = fname.rfind(".")
+                if dot <= 0 or fname[dot:].lower() not in extensions:
                     continue
 
                 filepath = os.path.join(root, fname)
 
-                if exclude_patterns:
-                    rel_path = os.path.relpath(filepath, directory)
-                    excluded = False
-                    for pattern in exclude_patterns:
-                        if fnmatch.fnmatch(rel_path, pattern) or fnmatch.fnmatch(filepath, pattern):
-                            excluded = True
-                            break
-                    if excluded:
+                if exclude_match is not None:
+                    norm_path = normcase(filepath)
+                    if exclude_match(norm_path[prefix_len:]) or exclude_match(norm_path):
                         continue
 
-                paths.append(filepath)
+                found.append(filepath)
+
+            # Sort only the photos that survived filtering, not every entry
+            # (sidecars, thumbnails, @eaDir...); same per-directory order.
+            found.sort()
+            paths.extend(found)
 
     return paths
 
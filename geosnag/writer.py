@@ -11,6 +11,8 @@ Backend selection
               Linux and macOS. May not be available on older Synology DSM.
 2. exiftool — fallback. Probed at: exiftool, /opt/bin/exiftool, /usr/bin/exiftool.
               Install on Synology via Entware: opkg install perl-image-exiftool
+              Batch callers can use BatchExifWriter to keep one
+              ``exiftool -stay_open`` process alive for the whole run.
 
 Safety guarantee
 ----------------
@@ -21,15 +23,18 @@ rename strategy. A failed write leaves the original intact in both cases.
 
 from __future__ import annotations
 
-import importlib.util
+import atexit
 import logging
 import os
+import queue
+import shutil
 import subprocess
+import threading
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from . import MARKER_PREFIX, PROJECT_NAME, PROJECT_TAG, __version__
+from . import DATACLASS_SLOTS, MARKER_PREFIX, PROJECT_NAME, PROJECT_TAG, __version__
 
 logger = logging.getLogger(f"{PROJECT_NAME.lower()}.writer")
 
@@ -45,12 +50,12 @@ GEOSNAG_MARKER_PREFIX = MARKER_PREFIX
 
 def _has_pyexiv2() -> bool:
     """Return True if pyexiv2 can be imported successfully (not just installed)."""
-    if importlib.util.find_spec("pyexiv2") is None:
-        return False
     try:
         import pyexiv2  # noqa: F401  — test import only
 
         return True
+    except ImportError:
+        return False
     except OSError:
         # libexiv2.so failed to load (e.g. glibc version mismatch on Synology)
         return False
@@ -61,19 +66,74 @@ def _has_pyexiv2() -> bool:
 def _probe_cmd(cmd: List[str]) -> bool:
     """Return True if running cmd + ['-ver'] exits 0."""
     try:
-        return subprocess.run(cmd + ["-ver"], capture_output=True, timeout=5).returncode == 0
+        result = subprocess.run(cmd + ["-ver"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=5)
+        return result.returncode == 0
     except (FileNotFoundError, subprocess.TimeoutExpired, OSError):
         return False
 
 
+_EXIFTOOL_CANDIDATES = ("exiftool", "/opt/bin/exiftool", "/usr/bin/exiftool")
+
+
 def _find_exiftool() -> Optional[List[str]]:
-    """Return the exiftool invocation command, or None if not installed."""
-    for candidate in ("exiftool", "/opt/bin/exiftool", "/usr/bin/exiftool"):
-        if _probe_cmd([candidate]):
-            return [candidate]
+    """
+    Return the exiftool invocation command, or None if not installed.
+
+    Only resolves each candidate to an executable file (no ``exiftool -ver``
+    run), so importing the writer doesn't pay Perl startup; whether it
+    actually runs is checked on first use by ``_resolve_exiftool``.
+    """
+    for candidate in _EXIFTOOL_CANDIDATES:
+        path = shutil.which(candidate)
+        if path:
+            return [path]
     return None
 
 
+_EXIFTOOL_RUNS: Dict[Tuple[str, ...], bool] = {}
+_EXIFTOOL_RUNS_LOCK = threading.Lock()
+
+
+def _exiftool_runs(cmd: List[str]) -> bool:
+    """
+    Return True if ``cmd -ver`` succeeds, running it only once per command.
+
+    Called before the first exiftool write rather than at import, so a
+    script that is present but cannot run (e.g. no Perl on DSM) is caught
+    once instead of failing every file.
+    """
+    key = tuple(cmd)
+    with _EXIFTOOL_RUNS_LOCK:
+        ok = _EXIFTOOL_RUNS.get(key)
+        if ok is None:
+            ok = _EXIFTOOL_RUNS[key] = _probe_cmd(cmd)
+            if not ok:
+                logger.warning(f"exiftool found but does not run: {' '.join(cmd)} -ver failed")
+    return ok
+
+
+def _resolve_exiftool() -> Optional[List[str]]:
+    """
+    Return the exiftool command to write with, checking that it runs.
+
+    ``_EXIFTOOL`` is only the first candidate found on disk. If it fails
+    ``-ver`` (e.g. /usr/bin/exiftool without Perl while /opt/bin/exiftool
+    works), the candidates are tried in order and the first that runs
+    replaces it. If none runs, ``_EXIFTOOL`` is returned unchanged and its
+    writes fail with "does not run".
+    """
+    global _EXIFTOOL
+    if _EXIFTOOL is None or _exiftool_runs(_EXIFTOOL):
+        return _EXIFTOOL
+    for candidate in _EXIFTOOL_CANDIDATES:
+        path = shutil.which(candidate)
+        if path and _exiftool_runs([path]):
+            logger.info(f"Using exiftool at {path}")
+            _EXIFTOOL = [path]
+            break
+    return _EXIFTOOL
+
+
 # Evaluate once at import time so every write call doesn't re-probe.
 _PYEXIV2_OK: bool = _has_pyexiv2()
 _EXIFTOOL: Optional[List[str]] = None if _PYEXIV2_OK else _find_exiftool()
@@ -94,7 +154,7 @@ else:
 # ---------------------------------------------------------------------------
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class WriteResult:
     """Result of a GPS write operation."""
 
@@ -106,8 +166,9 @@ class WriteResult:
 
 def _decimal_to_dms_rational(decimal: float) -> str:
     """Convert decimal degrees to EXIF DMS rational string (for pyexiv2)."""
-    d = int(abs(decimal))
-    m_full = (abs(decimal) - d) * 60
+    decimal = abs(decimal)
+    d = int(decimal)
+    m_full = (decimal - d) * 60
     m = int(m_full)
     s = round((m_full - m) * 60 * 10000)
     return f"{d}/1 {m}/1 {s}/10000"
@@ -119,11 +180,36 @@ def _make_stamp() -> str:
     return f"{MARKER_PREFIX}v{__version__}:{now}"
 
 
+# One marker per run: every file stamped in the same --apply run records the
+# run's start time, and the clock read + strftime happen once, not per file.
+_RUN_STAMP: Optional[str] = None
+
+
+def get_run_stamp() -> str:
+    """Return the processed marker for the current run, creating it on first use."""
+    global _RUN_STAMP
+    if _RUN_STAMP is None:
+        _RUN_STAMP = _make_stamp()
+    return _RUN_STAMP
+
+
+def reset_run_stamp() -> None:
+    """Start a new run: the next get_run_stamp() call takes a fresh timestamp."""
+    global _RUN_STAMP
+    _RUN_STAMP = None
+
+
 # ---------------------------------------------------------------------------
 # pyexiv2 backend
 # ---------------------------------------------------------------------------
 
 
+# pyexiv2 is not thread-safe (its C++ side keeps global state), so every
+# Image open/modify/close from the write threads goes through one lock.
+# XMP sidecar files and exiftool processes still run in parallel.
+_PYEXIV2_LOCK = threading.Lock()
+
+
 def _write_gps_pyexiv2(
     filepath: str,
     latitude: float,
@@ -154,22 +240,24 @@ def _write_gps_pyexiv2(
     if stamp:
         gps_data[GEOSNAG_TAG] = stamp
 
-    img = pyexiv2.Image(filepath)
-    try:
-        img.modify_exif(gps_data)
-    finally:
-        img.close()
+    with _PYEXIV2_LOCK:
+        img = pyexiv2.Image(filepath)
+        try:
+            img.modify_exif(gps_data)
+        finally:
+            img.close()
 
 
 def _stamp_pyexiv2(filepath: str, stamp: str) -> None:
     """Write stamp tag only via pyexiv2. Raises on failure."""
     import pyexiv2
 
-    img = pyexiv2.Image(filepath)
-    try:
-        img.modify_exif({GEOSNAG_TAG: stamp})
-    finally:
-        img.close()
+    with _PYEXIV2_LOCK:
+        img = pyexiv2.Image(filepath)
+        try:
+            img.modify_exif({GEOSNAG_TAG: stamp})
+        finally:
+            img.close()
 
 
 # ---------------------------------------------------------------------------
@@ -177,21 +265,17 @@ def _stamp_pyexiv2(filepath: str, stamp: str) -> None:
 # ---------------------------------------------------------------------------
 
 
-def _write_gps_exiftool(
-    filepath: str,
+def _exiftool_gps_args(
     latitude: float,
     longitude: float,
     altitude: Optional[float],
     stamp: Optional[str],
-    exiftool: List[str],
-) -> None:
-    """Write GPS (and optional stamp) via exiftool subprocess. Raises on failure."""
+) -> List[str]:
+    """Build the ExifTool tag assignments for a GPS write (no command or file)."""
     lat_ref = "N" if latitude >= 0 else "S"
     lon_ref = "E" if longitude >= 0 else "W"
 
     args = [
-        *exiftool,
-        "-overwrite_original",
         f"-GPSLatitude={abs(latitude)}",
         f"-GPSLatitudeRef={lat_ref}",
         f"-GPSLongitude={abs(longitude)}",
@@ -208,9 +292,29 @@ def _write_gps_exiftool(
     if stamp:
         args += [f"-Software={stamp}"]
 
-    args.append(filepath)
+    return args
+
+
+def _write_gps_exiftool(
+    filepath: str,
+    latitude: float,
+    longitude: float,
+    altitude: Optional[float],
+    stamp: Optional[str],
+    exiftool: List[str],
+) -> None:
+    """Write GPS (and optional stamp) via exiftool subprocess. Raises on failure."""
+    if not _exiftool_runs(exiftool):
+        raise RuntimeError(f"exiftool does not run: {' '.join(exiftool)}")
+    args = [
+        *exiftool,
+        "-overwrite_original",
+        *_exiftool_gps_args(latitude, longitude, altitude, stamp),
+        filepath,
+    ]
 
-    result = subprocess.run(args, capture_output=True, timeout=30, encoding="utf-8")
+    # Only the exit status and a short stderr are needed: stdout goes to /dev/null
+    result = subprocess.run(args, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=30, encoding="utf-8")
     if result.returncode != 0:
         stderr = (result.stderr or "").strip()[:500]
         raise RuntimeError(stderr or "exiftool returned non-zero exit code")
@@ -218,9 +322,12 @@ def _write_gps_exiftool(
 
 def _stamp_exiftool(filepath: str, stamp: str, exiftool: List[str]) -> None:
     """Write stamp tag only via exiftool. Raises on failure."""
+    if not _exiftool_runs(exiftool):
+        raise RuntimeError(f"exiftool does not run: {' '.join(exiftool)}")
     result = subprocess.run(
         [*exiftool, "-overwrite_original", f"-Software={stamp}", filepath],
-        capture_output=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
         timeout=30,
         encoding="utf-8",
     )
@@ -229,23 +336,225 @@ def _stamp_exiftool(filepath: str, stamp: str, exiftool: List[str]) -> None:
         raise RuntimeError(stderr or "exiftool stamp failed")
 
 
+def _argfile_safe(arg: str) -> bool:
+    """
+    Return True if arg survives as one line of a ``-stay_open`` argfile.
+
+    exiftool reads the stream one argument per line, skips lines starting
+    with ``#`` and trims surrounding whitespace, and the pipe is UTF-8 text;
+    names that break any of that (embedded newline, undecodable bytes as
+    surrogate escapes) must go through argv instead.
+    """
+    if "\n" in arg or "\r" in arg or arg.startswith("#") or arg != arg.strip():
+        return False
+    try:
+        arg.encode("utf-8")
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+def _read_until(stream, sentinel: str) -> str:
+    """Read lines from an exiftool pipe until the sentinel line; return the text before it."""
+    lines = []
+    while True:
+        line = stream.readline()
+        if not line:
+            raise RuntimeError("exiftool batch process exited unexpectedly")
+        if line.rstrip("\r\n") == sentinel:
+            return "".join(lines)
+        lines.append(line)
+
+
+class BatchExifWriter:
+    """
+    Persistent ExifTool processes for writing many files in one session.
+
+    Runs ``exiftool -stay_open True -@ -`` and feeds it one command per file
+    over stdin, so the Perl interpreter and module load are paid once per
+    process instead of once per file. Up to ``processes`` such processes are
+    started lazily, one per concurrently writing thread, so a threaded apply
+    is not funnelled through a single exiftool. Each process handles one
+    command at a time, since stay_open is a single request/response stream.
+    A process that exits, or does not answer a command within ``timeout``
+    seconds, is killed and replaced on the next command. File names that
+    can't be sent as one argfile line (newline, undecodable bytes) are
+    written with a one-shot exiftool run instead. All processes are
+    shut down when the context exits (or at interpreter exit, if the session
+    is never closed).
+
+    Usage:
+        with BatchExifWriter(_EXIFTOOL, processes=4) as batch:
+            for path in paths:
+                write_gps_to_exif(path, lat, lon, batch=batch)
+    """
+
+    def __init__(self, exiftool: List[str], processes: int = 1, timeout: float = 30):
+        self.exiftool = exiftool
+        self.processes = max(1, processes)
+        self.timeout = timeout
+        self._procs = []  # type: List[subprocess.Popen]
+        self._idle = queue.SimpleQueue()  # started processes not running a command; None = freed slot
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> BatchExifWriter:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _start(self) -> subprocess.Popen:
+        if not _exiftool_runs(self.exiftool):
+            raise RuntimeError(f"exiftool does not run: {' '.join(self.exiftool)}")
+        proc = subprocess.Popen(
+            [*self.exiftool, "-stay_open", "True", "-@", "-"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            encoding="utf-8",
+        )
+        if not self._procs:
+            atexit.register(self.close)
+        self._procs.append(proc)
+        return proc
+
+    def _acquire(self) -> subprocess.Popen:
+        """Take a live idle process, starting a new one while under the limit, else wait for one."""
+        while True:
+            with self._lock:
+                if self._idle.empty() and len(self._procs) < self.processes:
+                    return self._start()
+            proc = self._idle.get()
+            if proc is None:
+                continue  # a dropped process freed a slot: start its replacement
+            if proc.poll() is None:
+                return proc
+            # Exited while idle (crash, OOM kill): discard it and try again.
+            self._drop(proc)
+
+    def _drop(self, proc: subprocess.Popen) -> None:
+        """Kill a dead or hung process and forget it, waking one waiter to replace it."""
+        with self._lock:
+            if proc in self._procs:
+                self._procs.remove(proc)
+        try:
+            proc.kill()
+            proc.wait()
+        except OSError:
+            pass
+        for stream in (proc.stdin, proc.stdout, proc.stderr):
+            try:
+                stream.close()
+            except OSError:
+                pass
+        self._idle.put(None)
+
+    def execute(self, args: List[str]) -> str:
+        """Run one ExifTool command (one argument per item). Returns stdout; raises on failure."""
+        proc = self._acquire()
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+        ready_out = f"{{ready{seq}}}"
+        ready_err = f"{{ready_err:{seq}}}"
+
+        # A hung exiftool would block readline() forever; past the deadline
+        # the watchdog kills it, which ends the read with EOF.
+        timed_out = threading.Event()
+
+        def expire() -> None:
+            timed_out.set()
+            proc.kill()
+
+        watchdog = threading.Timer(self.timeout, expire)
+        watchdog.start()
+        try:
+            # -echo4 prints a marker to stderr once the command finishes, so
+            # errors from this command can be told apart from the next one's.
+            proc.stdin.write("\n".join([*args, "-echo4", ready_err, f"-execute{seq}"]) + "\n")
+            proc.stdin.flush()
+
+            stdout = _read_until(proc.stdout, ready_out)
+            stderr = _read_until(proc.stderr, ready_err)
+        except BaseException as e:
+            # The stream is out of step (or the process is gone): never reuse it.
+            self._drop(proc)
+            if timed_out.is_set():
+                raise RuntimeError(f"exiftool batch command timed out after {self.timeout:g}s") from e
+            raise
+        finally:
+            watchdog.cancel()
+
+        if timed_out.is_set() or proc.poll() is not None:
+            self._drop(proc)
+        else:
+            self._idle.put(proc)
+        if "Error" in stderr or "weren't updated" in stdout:
+            raise RuntimeError(stderr.strip()[:500] or "exiftool reported an error")
+        return stdout
+
+    def write_gps(
+        self,
+        filepath: str,
+        latitude: float,
+        longitude: float,
+        altitude: Optional[float],
+        stamp: Optional[str],
+    ) -> None:
+        """Write GPS (and optional stamp) through a persistent process. Raises on failure."""
+        if not _argfile_safe(filepath):
+            _write_gps_exiftool(filepath, latitude, longitude, altitude, stamp, self.exiftool)
+            return
+        self.execute(["-overwrite_original", *_exiftool_gps_args(latitude, longitude, altitude, stamp), filepath])
+
+    def stamp(self, filepath: str, stamp: str) -> None:
+        """Write stamp tag only through a persistent process. Raises on failure."""
+        if not _argfile_safe(filepath):
+            _stamp_exiftool(filepath, stamp, self.exiftool)
+            return
+        self.execute(["-overwrite_original", f"-Software={stamp}", filepath])
+
+    def close(self) -> None:
+        """Ask every exiftool process to exit and reap it."""
+        with self._lock:
+            procs, self._procs = self._procs, []
+            self._idle = queue.SimpleQueue()
+        atexit.unregister(self.close)
+        if not procs:
+            return
+        for proc in procs:
+            try:
+                proc.stdin.write("-stay_open\nFalse\n")
+                proc.stdin.flush()
+                proc.stdin.close()
+                proc.wait(timeout=30)
+            except (OSError, ValueError, subprocess.TimeoutExpired) as e:
+                logger.warning(f"exiftool batch process did not exit cleanly: {e}")
+                proc.kill()
+                proc.wait()
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 
 
-def stamp_processed(filepath: str) -> bool:
+def stamp_processed(filepath: str, batch: Optional[BatchExifWriter] = None) -> bool:
     """
     Write the GeoSnag processed marker to a file's Exif.Image.Software tag.
 
-    Tries pyexiv2 first, falls back to exiftool. Returns True on success.
+    Tries pyexiv2 first, falls back to exiftool (through ``batch`` if given).
+    Returns True on success.
     """
-    stamp = _make_stamp()
+    stamp = get_run_stamp()
     try:
         if _PYEXIV2_OK:
             _stamp_pyexiv2(filepath, stamp)
+        elif batch is not None:
+            batch.stamp(filepath, stamp)
         elif _EXIFTOOL:
-            _stamp_exiftool(filepath, stamp, _EXIFTOOL)
+            _stamp_exiftool(filepath, stamp, _resolve_exiftool())
         else:
             logger.warning(f"No write backend available — cannot stamp {filepath}")
             return False
@@ -262,6 +571,7 @@ def write_gps_to_exif(
     longitude: float,
     altitude: Optional[float] = None,
     stamp_after_write: bool = True,
+    batch: Optional[BatchExifWriter] = None,
 ) -> WriteResult:
     """
     Write GPS coordinates into a photo's EXIF data.
@@ -276,6 +586,7 @@ def write_gps_to_exif(
         longitude: GPS longitude in decimal degrees (positive=E, negative=W)
         altitude: Optional GPS altitude in meters (positive=above sea level)
         stamp_after_write: If True, write GeoSnag processed tag after GPS
+        batch: Persistent exiftool session to use instead of one subprocess per file
 
     Returns:
         WriteResult with success/failure info
@@ -288,7 +599,7 @@ def write_gps_to_exif(
             error=f"Invalid coordinates: ({latitude}, {longitude})",
         )
 
-    if not _PYEXIV2_OK and not _EXIFTOOL:
+    if not _PYEXIV2_OK and not _EXIFTOOL and batch is None:
         return WriteResult(
             filepath=filepath,
             success=False,
@@ -296,13 +607,15 @@ def write_gps_to_exif(
             error=("No write backend available. Install exiftool via: opkg install perl-image-exiftool"),
         )
 
-    stamp = _make_stamp() if stamp_after_write else None
+    stamp = get_run_stamp() if stamp_after_write else None
 
     try:
         if _PYEXIV2_OK:
             _write_gps_pyexiv2(filepath, latitude, longitude, altitude, stamp)
+        elif batch is not None:
+            batch.write_gps(filepath, latitude, longitude, altitude, stamp)
         else:
-            _write_gps_exiftool(filepath, latitude, longitude, altitude, stamp, _EXIFTOOL)
+            _write_gps_exiftool(filepath, latitude, longitude, altitude, stamp, _resolve_exiftool())
 
         logger.debug(f"GPS written: {filepath}")
         return WriteResult(filepath=filepath, success=True, method="exif")
@@ -312,12 +625,36 @@ def write_gps_to_exif(
         return WriteResult(filepath=filepath, success=False, method="exif", error=str(e))
 
 
+# Sidecar skeleton, encoded once; per-file work is one bytes %-format of the
+# coordinate fields. The packet header carries a real U+FEFF byte-order mark.
+_XMP_TEMPLATE = f"""<?xpacket begin='\ufeff' id='W5M0MpCehiHzreSzNTczkc9d'?>
+<x:xmpmeta xmlns:x='adobe:ns:meta/'>
+  <rdf:RDF xmlns:rdf='http://www.w3.org/1999/02/22-rdf-syntax-ns#'>
+    <rdf:Description rdf:about=''
+      xmlns:exif='http://ns.adobe.com/exif/1.0/'
+      xmlns:xmp='http://ns.adobe.com/xap/1.0/'>
+      <exif:GPSVersionID>2.3.0.0</exif:GPSVersionID>
+      <exif:GPSLatitude>%b</exif:GPSLatitude>
+      <exif:GPSLongitude>%b</exif:GPSLongitude>
+      <exif:GPSMapDatum>WGS-84</exif:GPSMapDatum>%b
+      <xmp:CreatorTool>{PROJECT_NAME} v{__version__}</xmp:CreatorTool>
+    </rdf:Description>
+  </rdf:RDF>
+</x:xmpmeta>
+<?xpacket end='w'?>""".encode("utf-8")
+
+_XMP_ALTITUDE = (
+    b"\n      <exif:GPSAltitude>%.2f</exif:GPSAltitude>\n      <exif:GPSAltitudeRef>%b</exif:GPSAltitudeRef>"
+)
+
+
 def write_gps_xmp_sidecar(
     filepath: str,
     latitude: float,
     longitude: float,
     altitude: Optional[float] = None,
     stamp_after_write: bool = True,
+    batch: Optional[BatchExifWriter] = None,
 ) -> WriteResult:
     """
     Write GPS coordinates to an XMP sidecar file (non-destructive).
@@ -331,10 +668,11 @@ def write_gps_xmp_sidecar(
         longitude: GPS longitude in decimal degrees
         altitude: Optional GPS altitude in meters
         stamp_after_write: If True, write GeoSnag tag to original file EXIF
+        batch: Persistent exiftool session to use for the stamp
     """
     try:
-        lat_ref = "N" if latitude >= 0 else "S"
-        lon_ref = "E" if longitude >= 0 else "W"
+        lat_ref = b"N" if latitude >= 0 else b"S"
+        lon_ref = b"E" if longitude >= 0 else b"W"
 
         lat_abs = abs(latitude)
         lon_abs = abs(longitude)
@@ -343,43 +681,32 @@ def write_gps_xmp_sidecar(
         lon_deg = int(lon_abs)
         lon_min = (lon_abs - lon_deg) * 60
 
-        lat_xmp = f"{lat_deg},{lat_min:.6f}{lat_ref}"
-        lon_xmp = f"{lon_deg},{lon_min:.6f}{lon_ref}"
+        lat_xmp = b"%d,%.6f%b" % (lat_deg, lat_min, lat_ref)
+        lon_xmp = b"%d,%.6f%b" % (lon_deg, lon_min, lon_ref)
 
-        alt_xml = ""
+        alt_xml = b""
         if altitude is not None:
-            alt_xml = f"\n      <exif:GPSAltitude>{abs(altitude):.2f}</exif:GPSAltitude>"
-            alt_xml += f"\n      <exif:GPSAltitudeRef>{'0' if altitude >= 0 else '1'}</exif:GPSAltitudeRef>"
+            alt_xml = _XMP_ALTITUDE % (abs(altitude), b"0" if altitude >= 0 else b"1")
 
-        xmp_content = f"""<?xpacket begin='\xef\xbb\xbf' id='W5M0MpCehiHzreSzNTczkc9d'?>
-<x:xmpmeta xmlns:x='adobe:ns:meta/'>
-  <rdf:RDF xmlns:rdf='http://www.w3.org/1999/02/22-rdf-syntax-ns#'>
-    <rdf:Description rdf:about=''
-      xmlns:exif='http://ns.adobe.com/exif/1.0/'
-      xmlns:xmp='http://ns.adobe.com/xap/1.0/'>
-      <exif:GPSVersionID>2.3.0.0</exif:GPSVersionID>
-      <exif:GPSLatitude>{lat_xmp}</exif:GPSLatitude>
-      <exif:GPSLongitude>{lon_xmp}</exif:GPSLongitude>
-      <exif:GPSMapDatum>WGS-84</exif:GPSMapDatum>{alt_xml}
-      <xmp:CreatorTool>{PROJECT_NAME} v{__version__}</xmp:CreatorTool>
-    </rdf:Description>
-  </rdf:RDF>
-</x:xmpmeta>
-<?xpacket end='w'?>"""
+        data = _XMP_TEMPLATE % (lat_xmp, lon_xmp, alt_xml)
 
         base, _ = os.path.splitext(filepath)
         xmp_path = base + ".xmp"
 
-        if os.path.exists(xmp_path):
+        try:
+            # Common case: no sidecar yet. O_EXCL creates it in the same call
+            # that checks for it, so no separate os.path.exists() stat.
+            fd = os.open(xmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        except FileExistsError:
             logger.warning(f"XMP sidecar already exists, overwriting: {xmp_path}")
-
-        with open(xmp_path, "w", encoding="utf-8") as f:
-            f.write(xmp_content)
+            fd = os.open(xmp_path, os.O_WRONLY | os.O_TRUNC)
+        with open(fd, "wb") as f:
+            f.write(data)
 
         logger.debug(f"XMP sidecar written: {xmp_path}")
 
         if stamp_after_write:
-            stamp_processed(filepath)
+            stamp_processed(filepath, batch=batch)
 
         return WriteResult(filepath=filepath, success=True, method="xmp_sidecar")
 
@@ -98,6 +98,13 @@ class TestHelp:
         r = run("--help")
         assert "--report" in r.stdout
 
+    def test_version_flag_prints_version(self):
+        from geosnag import __version__
+
+        r = run("--version")
+        assert r.returncode == 0
+        assert __version__ in r.stdout
+
 
 # ---------------------------------------------------------------------------
 # Config errors
@@ -239,6 +239,159 @@ def test_index_size_invalidation():
         check("Size: cache miss after size change", cached_after is None)
 
 
+def test_index_stat_reused_after_miss():
+    """Test that update() reuses the stat taken by a missed lookup()."""
+    print("\n── ScanIndex: Stat Reuse ──")
+    from unittest import mock
+
+    import geosnag.index as index_mod
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_file = os.path.join(tmpdir, "photo.jpg")
+        _create_test_jpeg(test_file)
+        meta = PhotoMeta(filepath=test_file, filename="photo.jpg", extension=".jpg")
+
+        idx = ScanIndex(os.path.join(tmpdir, "test_index.json"))
+        with mock.patch.object(index_mod, "_stat_file", wraps=index_mod._stat_file) as stat_spy:
+            check("StatReuse: new file misses", idx.lookup(test_file) is None)
+            idx.update(meta)
+            check("StatReuse: one stat for lookup + update", stat_spy.call_count == 1, str(stat_spy.call_count))
+
+        check("StatReuse: cache consumed", test_file not in idx._stat_cache)
+        check("StatReuse: entry hits afterwards", idx.lookup(test_file) is not None)
+
+        # update() without a preceding lookup still stats the file itself
+        idx2 = ScanIndex(os.path.join(tmpdir, "other_index.json"))
+        idx2.update(meta)
+        check("StatReuse: direct update records size", idx2.entries[test_file]["size"] == os.path.getsize(test_file))
+
+
+def test_index_content_hash_survives_mtime_change():
+    """Test that a touched-but-identical file is still a cache hit."""
+    print("\n── ScanIndex: Content Hash ──")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        idx_path = os.path.join(tmpdir, "test_index.json")
+        test_file = os.path.join(tmpdir, "photo.jpg")
+        _create_test_jpeg(test_file)
+
+        idx = ScanIndex(idx_path)
+        idx.update(PhotoMeta(filepath=test_file, filename="photo.jpg", extension=".jpg"))
+        idx.save()
+        check("Hash: stored in entry", bool(idx.entries[test_file].get("content_hash")))
+
+        # Same bytes, new mtime — as after a copy or restore
+        new_mtime = os.path.getmtime(test_file) + 3600
+        os.utime(test_file, (new_mtime, new_mtime))
+
+        idx2 = ScanIndex(idx_path)
+        idx2.load()
+        check("Hash: hit after mtime-only change", idx2.lookup(test_file) is not None)
+        check("Hash: stored mtime refreshed", idx2.entries[test_file]["mtime"] == new_mtime)
+        check("Hash: index marked dirty", idx2._dirty)
+
+        # Same size, different bytes, new mtime — must miss
+        with open(test_file, "r+b") as f:
+            data = f.read()
+            f.seek(0)
+            f.write(bytes(b ^ 0xFF for b in data[:16]))
+        os.utime(test_file, (new_mtime + 60, new_mtime + 60))
+        check("Hash: miss after content change", idx2.lookup(test_file) is None)
+
+        # Entries written before content_hash existed fall back to mtime only
+        del idx2.entries[test_file]["content_hash"]
+        check("Hash: legacy entry misses on mtime change", idx2.lookup(test_file) is None)
+
+
+def test_index_content_hash_from_open_handle():
+    """Test that hashing through the scan's handle matches hashing by path."""
+    print("\n── ScanIndex: Content Hash From Handle ──")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_file = os.path.join(tmpdir, "photo.jpg")
+        _create_test_jpeg(test_file)
+        with open(test_file, "ab") as f:
+            f.write(os.urandom(3 * 64 * 1024))  # past both hashed windows
+        meta = PhotoMeta(filepath=test_file, filename="photo.jpg", extension=".jpg")
+
+        by_path = _photo_to_entry(meta)["content_hash"]
+        with open(test_file, "rb") as f:
+            f.seek(123)  # the scan leaves the position anywhere
+            by_handle = _photo_to_entry(meta, f=f)["content_hash"]
+        check("Handle: same hash as by path", by_path is not None and by_handle == by_path)
+
+        # A scan with an index opens each file once, not once more to hash
+        opened = []
+
+        def audit(event, args):
+            if event == "open" and args[0] == test_file:
+                opened.append(args)
+
+        sys.addaudithook(audit)
+        idx = ScanIndex(os.path.join(tmpdir, "test_index.json"))
+        scan_with_index([tmpdir], index=idx, workers=1)
+        check("Handle: single open per scanned file", len(opened) == 1)
+        check("Handle: entry hashed", idx.entries[test_file].get("content_hash") == by_path)
+
+
+def test_index_lookup_many():
+    """Test batched lookup with concurrent stat calls."""
+    print("\n── ScanIndex: Lookup Many ──")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = []
+        for i in range(10):
+            path = os.path.join(tmpdir, f"photo_{i}.jpg")
+            _create_test_jpeg(path)
+            paths.append(path)
+
+        idx = ScanIndex(os.path.join(tmpdir, "test_index.json"))
+        for path in paths[:6]:
+            idx.update(PhotoMeta(filepath=path, filename=os.path.basename(path), extension=".jpg"))
+        with open(paths[2], "ab") as f:
+            f.write(b"\x00" * 10)  # size change → miss
+        missing = os.path.join(tmpdir, "gone.jpg")
+        query = paths + [missing]
+
+        for workers in (1, 4, 32):
+            hits, misses = idx.lookup_many(query, workers=workers)
+            hit_paths = [p.filepath for p in hits]
+            check(f"LookupMany[{workers}]: hits", hit_paths == [p for i, p in enumerate(paths[:6]) if i != 2])
+            check(f"LookupMany[{workers}]: misses", misses == [paths[2]] + paths[6:] + [missing])
+
+        check("LookupMany: empty input", idx.lookup_many([], workers=4) == ([], []))
+        check("LookupMany: miss stat cached for update", paths[7] in idx._stat_cache)
+
+
+def test_index_concurrent_update():
+    """Test that update() can be called from several threads at once."""
+    print("\n── ScanIndex: Concurrent Update ──")
+    from concurrent.futures import ThreadPoolExecutor
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        metas = []
+        for i in range(40):
+            path = os.path.join(tmpdir, f"photo_{i}.jpg")
+            _create_test_jpeg(path)
+            metas.append(
+                PhotoMeta(
+                    filepath=path,
+                    filename=os.path.basename(path),
+                    extension=".jpg",
+                    datetime_original=datetime(2023, 6, 1 + i % 5, 12, 0, 0),
+                    has_gps=True,
+                )
+            )
+
+        idx = ScanIndex(os.path.join(tmpdir, "test_index.json"))
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(idx.update, metas))
+
+        check("Concurrent: all entries recorded", idx.size == 40)
+        check("Concurrent: all paths tracked as changed", len(idx._changed) == 40)
+        check("Concurrent: source dates marked", idx.refresh_source_fingerprints() == 5)
+
+
 def test_index_deleted_file():
     """Test lookup for a deleted file."""
     print("\n── ScanIndex: Deleted File ──")
@@ -323,6 +476,39 @@ def test_index_corrupt_file():
         check("Corrupt: entries empty", idx.size == 0)
 
 
+def test_index_serializer_fallback():
+    """Test that indexes written with and without orjson are interchangeable."""
+    print("\n── ScanIndex: Serializer Fallback ──")
+    import geosnag.index as index_mod
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        idx_path = os.path.join(tmpdir, "test_index.json")
+        entry = {"mtime": 1700000000.123456, "size": 42, "camera_model": "NIKON D610 Ü", "has_gps": False}
+
+        saved_orjson = index_mod.orjson
+        try:
+            index_mod.orjson = None
+            idx = ScanIndex(idx_path)
+            idx.entries["/fake/ü.jpg"] = dict(entry)
+            idx._dirty = True
+            idx.save()
+            with open(idx_path, "rb") as f:
+                stdlib_bytes = f.read()
+            check("Fallback: stdlib output is valid JSON", json.loads(stdlib_bytes)["entries"]["/fake/ü.jpg"] == entry)
+        finally:
+            index_mod.orjson = saved_orjson
+
+        idx2 = ScanIndex(idx_path)
+        check("Fallback: reload sees entry", idx2.load() == 1)
+        check("Fallback: entry preserved", idx2.entries.get("/fake/ü.jpg") == entry)
+
+        if saved_orjson is not None:
+            idx2._dirty = True
+            idx2.save()
+            with open(idx_path, "rb") as f:
+                check("Fallback: orjson output matches stdlib", f.read() == stdlib_bytes)
+
+
 def test_index_version_mismatch():
     """Test loading an index with wrong version."""
     print("\n── ScanIndex: Version Mismatch ──")
@@ -365,6 +551,151 @@ def test_index_no_dirty_on_no_change():
         check("NoDirty: file not re-written", mtime_before == mtime_after)
 
 
+def test_index_no_dirty_on_identical_rescan():
+    """Test that re-indexing an unchanged file keeps the entry and a clean index."""
+    print("\n── ScanIndex: Identical Rescan ──")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_file = os.path.join(tmpdir, "photo.jpg")
+        _create_test_jpeg(test_file)
+        meta = PhotoMeta(
+            filepath=test_file,
+            filename="photo.jpg",
+            extension=".jpg",
+            datetime_original=datetime(2023, 6, 15, 10, 0, 0),
+        )
+
+        idx = ScanIndex(os.path.join(tmpdir, "test_index.json"))
+        idx.update(meta)
+        idx.update_match_result(test_file, "no_match", "fp_1")
+        idx.save()
+
+        idx.update(meta)
+        check("IdenticalRescan: index stays clean", not idx._dirty)
+        check("IdenticalRescan: match cache kept", idx.get_match_result(test_file) == ("no_match", "fp_1"))
+
+        idx.update_match_result(test_file, "no_match", "fp_1")
+        check("IdenticalRescan: same match result stays clean", not idx._dirty)
+
+        idx.update_match_result(test_file, "matched", "fp_1")
+        check("IdenticalRescan: changed match result dirties", idx._dirty)
+
+
+def _fake_entry(i, date="2023-06-15"):
+    return {
+        "mtime": 1700000000.0 + i,
+        "size": 1000 + i,
+        "datetime_original": f"{date}T10:00:00",
+        "has_gps": i % 2 == 0,
+        "camera_make": "Apple",
+        "camera_model": "iPhone 15",
+    }
+
+
+def test_index_append_log():
+    """Test that small saves append to the log and reload on top of the snapshot."""
+    print("\n── ScanIndex: Append Log ──")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        idx_path = os.path.join(tmpdir, "test_index.json")
+        log_path = idx_path + ".log"
+
+        idx = ScanIndex(idx_path)
+        for i in range(200):
+            idx.entries[f"/fake/{i}.jpg"] = _fake_entry(i)
+        idx._dirty = True
+        idx.refresh_source_fingerprints()
+        idx.save()
+        with open(idx_path, "rb") as f:
+            snapshot = f.read()
+        check("Log: first save writes snapshot only", not os.path.exists(log_path))
+
+        idx2 = ScanIndex(idx_path)
+        idx2.load()
+        idx2.update_match_result("/fake/1.jpg", "no_match", "fp_1")
+        idx2.prune({p for p in idx2.entries if p != "/fake/0.jpg"})
+        idx2.refresh_source_fingerprints()
+        idx2.save()
+        with open(idx_path, "rb") as f:
+            check("Log: snapshot untouched by small save", f.read() == snapshot)
+        check("Log: log file written", os.path.exists(log_path))
+        check("Log: index clean after append", not idx2._dirty)
+
+        idx3 = ScanIndex(idx_path)
+        check("Log: reload sees prune", idx3.load() == 199 and "/fake/0.jpg" not in idx3.entries)
+        check("Log: reload sees match result", idx3.get_match_result("/fake/1.jpg") == ("no_match", "fp_1"))
+        check("Log: reload sees fingerprint", idx3.source_fingerprints == idx2.source_fingerprints)
+
+        # Enough changes to outgrow the log budget → full snapshot, log removed
+        idx3.update_match_results_bulk((p, "matched", "fp_x") for p in list(idx3.entries))
+        idx3.save()
+        check("Log: large save compacts", not os.path.exists(log_path))
+        idx4 = ScanIndex(idx_path)
+        idx4.load()
+        check("Log: compacted snapshot complete", idx4.get_match_result("/fake/5.jpg") == ("matched", "fp_x"))
+        check("Log: compacted snapshot keeps prune", idx4.size == 199)
+
+
+def test_index_append_log_truncated():
+    """Test that a partial trailing log record is ignored and forces a compaction."""
+    print("\n── ScanIndex: Truncated Log ──")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        idx_path = os.path.join(tmpdir, "test_index.json")
+        log_path = idx_path + ".log"
+
+        idx = ScanIndex(idx_path)
+        for i in range(200):
+            idx.entries[f"/fake/{i}.jpg"] = _fake_entry(i)
+        idx._dirty = True
+        idx.save()
+
+        idx.update_match_result("/fake/1.jpg", "no_match", "fp_1")
+        idx.save()
+        with open(log_path, "ab") as f:
+            f.write(b'{"entries":{"/fake/2.jpg":{"mti')
+
+        idx2 = ScanIndex(idx_path)
+        check("Truncated: load succeeds", idx2.load() == 200)
+        check("Truncated: complete record applied", idx2.get_match_result("/fake/1.jpg") == ("no_match", "fp_1"))
+        check("Truncated: partial record ignored", idx2.entries["/fake/2.jpg"] == _fake_entry(2))
+
+        idx2.update_match_result("/fake/3.jpg", "no_match", "fp_3")
+        idx2.save()
+        check("Truncated: next save compacts", not os.path.exists(log_path))
+
+
+def test_index_append_log_corrupt_record():
+    """Test that valid JSON that isn't a log record is treated like a truncated log."""
+    print("\n── ScanIndex: Corrupt Log Record ──")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        idx_path = os.path.join(tmpdir, "test_index.json")
+        log_path = idx_path + ".log"
+
+        idx = ScanIndex(idx_path)
+        for i in range(200):
+            idx.entries[f"/fake/{i}.jpg"] = _fake_entry(i)
+        idx._dirty = True
+        idx.save()
+
+        for n, bad in enumerate((b"[]", b"1", b'{"entries": []}')):
+            idx.update_match_result("/fake/1.jpg", "no_match", f"fp_1_{n}")
+            idx.save()
+            with open(log_path, "ab") as f:
+                f.write(bad + b"\n")
+
+            idx2 = ScanIndex(idx_path)
+            check(f"Corrupt {bad!r}: load succeeds", idx2.load() == 200)
+            applied = idx2.get_match_result("/fake/1.jpg") == ("no_match", f"fp_1_{n}")
+            check(f"Corrupt {bad!r}: earlier record applied", applied)
+
+            idx2.update_match_result("/fake/3.jpg", "no_match", f"fp_3_{n}")
+            idx2.save()
+            check(f"Corrupt {bad!r}: next save compacts", not os.path.exists(log_path))
+            idx = idx2
+
+
 def test_index_serialization_roundtrip():
     """Test _photo_to_entry / _entry_to_photo roundtrip."""
     print("\n── ScanIndex: Serialization Roundtrip ──")
@@ -426,6 +757,10 @@ def test_progress_tracker():
     check("Progress: errors=1", progress.errors == 1)
     check("Progress: cache_hits=1", progress.cache_hits == 1)
 
+    progress.tick_cached(40)
+    check("Progress: bulk cached scanned=43", progress.scanned == 43)
+    check("Progress: bulk cache_hits=41", progress.cache_hits == 41)
+
 
 # ─── _collect_file_paths Tests ───
 
@@ -469,6 +804,35 @@ def test_collect_file_paths():
         check("Collect bad dir: returns empty", len(paths_bad) == 0)
 
 
+def test_collect_matches_os_walk():
+    """scandir walker yields the same paths, in the same order, as os.walk."""
+    print("\n── _collect_file_paths vs os.walk ──")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for rel in ["z.jpg", "a.jpg", "b/c.nef", "b/d/e.jpg", "a_dir/f.png", "a_dir/g.txt"]:
+            path = os.path.join(tmpdir, rel)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(b"\x00")
+        # Symlinked file is collected, symlinked directory is not entered
+        os.symlink(os.path.join(tmpdir, "a.jpg"), os.path.join(tmpdir, "link.jpg"))
+        os.symlink(os.path.join(tmpdir, "b"), os.path.join(tmpdir, "linkdir"))
+
+        expected = []
+        for root, _dirs, files in os.walk(tmpdir):
+            for fname in sorted(files):
+                if os.path.splitext(fname)[1].lower() in PHOTO_EXTS:
+                    expected.append(os.path.join(root, fname))
+
+        paths = _collect_file_paths([tmpdir], PHOTO_EXTS, recursive=True)
+        check("Walk parity: same paths and order", paths == expected, f"{paths} != {expected}")
+        check("Walk parity: symlinked file kept", os.path.join(tmpdir, "link.jpg") in paths)
+        check("Walk parity: symlinked dir not entered", not any("linkdir" in p for p in paths))
+
+        threaded = _collect_file_paths([tmpdir], PHOTO_EXTS, recursive=True, workers=4)
+        check("Walk parity: threaded walk same order", threaded == expected, f"{threaded} != {expected}")
+
+
 # ─── scan_with_index Integration Tests ───
 
 
@@ -849,6 +1213,41 @@ def test_match_cache_write_read():
         check("MatchCache: nonexistent returns None", status4 is None and fp4 is None)
 
 
+def test_match_cache_bulk_update():
+    """Test updating many match results in one call."""
+    print("\n── Match Cache: Bulk Update ──")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = []
+        for name in ("a.jpg", "b.jpg"):
+            path = os.path.join(tmpdir, name)
+            _create_test_jpeg(path)
+            paths.append(path)
+
+        idx = ScanIndex(os.path.join(tmpdir, "index.json"))
+        for path in paths:
+            idx.update(PhotoMeta(filepath=path, filename=os.path.basename(path), extension=".jpg"))
+        idx.save()
+
+        updated = idx.update_match_results_bulk(
+            [
+                (paths[0], "matched", "fp_a"),
+                (paths[1], "no_match", "fp_b"),
+                ("/nonexistent/path.jpg", "no_match", "fp_c"),
+            ]
+        )
+        check("Bulk: known entries updated", updated == 2)
+        check("Bulk: matched stored", idx.get_match_result(paths[0]) == ("matched", "fp_a"))
+        check("Bulk: no_match stored", idx.get_match_result(paths[1]) == ("no_match", "fp_b"))
+        check("Bulk: unknown path ignored", idx.get_match_result("/nonexistent/path.jpg") == (None, None))
+        check("Bulk: marks index dirty", idx._dirty)
+
+        idx.save()
+        check("Bulk: empty input leaves index clean", idx.update_match_results_bulk([]) == 0 and not idx._dirty)
+        unchanged = idx.update_match_results_bulk([(paths[0], "matched", "fp_a"), (paths[1], "no_match", "fp_b")])
+        check("Bulk: repeated results leave index clean", unchanged == 0 and not idx._dirty)
+
+
 def test_match_cache_threshold_invalidation():
     """Test that changing max_time_delta clears all match caches."""
     print("\n── Match Cache: Threshold Invalidation ──")
@@ -991,6 +1390,65 @@ def test_match_cache_index_clear():
         check("Clear: threshold reset", idx._match_threshold_minutes is None)
 
 
+def test_source_fingerprints_incremental():
+    """Test that per-date source fingerprints persist and only dirty dates change."""
+    print("\n── Source Fingerprints: Incremental ──")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = []
+        for name in ("a.jpg", "b.jpg", "c.jpg"):
+            path = os.path.join(tmpdir, name)
+            _create_test_jpeg(path)
+            paths.append(path)
+
+        idx_path = os.path.join(tmpdir, "index.json")
+        idx = ScanIndex(idx_path)
+
+        def source(path, day):
+            return PhotoMeta(
+                filepath=path,
+                filename=os.path.basename(path),
+                extension=".jpg",
+                datetime_original=datetime(2023, 6, day, 10, 0, 0),
+                has_gps=True,
+                gps_latitude=59.9,
+                gps_longitude=10.7,
+            )
+
+        idx.update(source(paths[0], 15))
+        idx.update(source(paths[1], 16))
+        check("Fingerprints: two dates recomputed", idx.refresh_source_fingerprints() == 2)
+        check("Fingerprints: keyed by date", set(idx.source_fingerprints) == {"2023-06-15", "2023-06-16"})
+        check("Fingerprints: no-op refresh", idx.refresh_source_fingerprints() == 0)
+
+        idx.save()
+        idx2 = ScanIndex(idx_path)
+        idx2.load()
+        check("Fingerprints: persist across reload", idx2.source_fingerprints == idx.source_fingerprints)
+
+        fp_16 = idx2.source_fingerprints["2023-06-16"]
+        fp_15 = idx2.source_fingerprints["2023-06-15"]
+        idx2.update(source(paths[2], 15))
+        check("Fingerprints: only dirty date recomputed", idx2.refresh_source_fingerprints() == 1)
+        check("Fingerprints: dirty date changed", idx2.source_fingerprints["2023-06-15"] != fp_15)
+        check("Fingerprints: clean date untouched", idx2.source_fingerprints["2023-06-16"] == fp_16)
+
+        idx2.prune({paths[0], paths[2]})
+        idx2.refresh_source_fingerprints()
+        check("Fingerprints: date dropped when last source pruned", "2023-06-16" not in idx2.source_fingerprints)
+
+        # Index saved before fingerprints were persisted → full rebuild
+        with open(idx_path, "r") as f:
+            data = json.load(f)
+        del data["source_fingerprints"]
+        with open(idx_path, "w") as f:
+            json.dump(data, f)
+        idx3 = ScanIndex(idx_path)
+        idx3.load()
+        check("Fingerprints: legacy index rebuilt", idx3.refresh_source_fingerprints() == 2)
+        check("Fingerprints: legacy rebuild matches", idx3.source_fingerprints == idx.source_fingerprints)
+
+
 if __name__ == "__main__":
     print("=" * 55)
     from geosnag import __version__
@@ -1003,12 +1461,22 @@ if __name__ == "__main__":
     test_index_save_load()
     test_index_mtime_invalidation()
     test_index_size_invalidation()
+    test_index_stat_reused_after_miss()
+    test_index_content_hash_survives_mtime_change()
+    test_index_content_hash_from_open_handle()
+    test_index_lookup_many()
+    test_index_concurrent_update()
     test_index_deleted_file()
     test_index_prune()
     test_index_clear()
     test_index_corrupt_file()
+    test_index_serializer_fallback()
     test_index_version_mismatch()
     test_index_no_dirty_on_no_change()
+    test_index_no_dirty_on_identical_rescan()
+    test_index_append_log()
+    test_index_append_log_truncated()
+    test_index_append_log_corrupt_record()
     test_index_serialization_roundtrip()
 
     # ScanProgress
@@ -1016,6 +1484,7 @@ if __name__ == "__main__":
 
     # _collect_file_paths
     test_collect_file_paths()
+    test_collect_matches_os_walk()
 
     # scan_with_index integration
     test_scan_with_index_no_cache()
@@ -1028,10 +1497,12 @@ if __name__ == "__main__":
 
     # Match cache
     test_match_cache_write_read()
+    test_match_cache_bulk_update()
     test_match_cache_threshold_invalidation()
     test_match_cache_cleared_on_rescan()
     test_match_cache_threshold_persists()
     test_match_cache_index_clear()
+    test_source_fingerprints_incremental()
 
     print()
     print("=" * 55)
@@ -59,10 +59,97 @@ def test_scanner():
     )
     check("NEF: no GPS (as expected)", not meta.has_gps)
     check("NEF: date_key", meta.date_key == "2017-09-23", meta.date_key or "None")
+    check("NEF: datetime_iso", meta.datetime_iso == "2017-09-23T23:11:37", meta.datetime_iso)
+    check("NEF: device_label", meta.device_label == "NIKON CORPORATION NIKON D610", meta.device_label)
     check("NEF: extension", meta.extension == ".nef", meta.extension)
     check("NEF: not processed", not meta.geosnag_processed)
 
 
+def test_tiff_reader_parity():
+    """Test that the direct TIFF/EXIF reader agrees with exifread."""
+    print("\n── Direct EXIF Reader Tests ──")
+    from fractions import Fraction
+
+    from PIL import Image
+
+    from geosnag.scanner import _scan_heic, _scan_tiff, _scan_with_exifread
+
+    for name in ("camera_no_gps.nef", "phone_with_gps.jpg"):
+        path = os.path.join(FIXTURES_DIR, name)
+        fast = _scan_tiff(path)
+        check(f"Reader: {name} handled directly", fast is not None)
+        check(f"Reader: {name} matches exifread", fast == _scan_with_exifread(path))
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # Big-endian EXIF, southern/western hemisphere, below sea level
+        jpg = os.path.join(tmpdir, "be.jpg")
+        exif = Image.Exif()
+        exif.endian = ">"
+        exif[0x010F] = "Canon"
+        exif[0x0131] = "GeoSnag:2024-01-01T00:00:00Z"
+        exif.get_ifd(0x8769)[0x9003] = "2021:05:06 07:08:09"
+        gps = exif.get_ifd(0x8825)
+        gps.update({1: "S", 2: (Fraction(33), Fraction(51), Fraction(54)), 3: "W", 4: (Fraction(70), Fraction(40), 0)})
+        gps.update({5: 1, 6: Fraction(125, 10)})
+        Image.new("RGB", (8, 8)).save(jpg, exif=exif.tobytes())
+
+        fast = _scan_tiff(jpg)
+        check("Reader: big-endian JPEG matches exifread", fast == _scan_with_exifread(jpg))
+        check("Reader: southern latitude negative", fast is not None and fast["gps_latitude"] < 0)
+        check("Reader: western longitude negative", fast is not None and fast["gps_longitude"] < 0)
+        check("Reader: altitude below sea level", fast is not None and fast["gps_altitude"] == -12.5)
+        check("Reader: processed marker seen", fast is not None and fast["geosnag_processed"])
+
+        # HEIC goes through the same IFD reader once pillow-heif finds the EXIF
+        heic = os.path.join(tmpdir, "be.heic")
+        Image.new("RGB", (64, 64)).save(heic, exif=exif.tobytes())
+        check("Reader: HEIC matches JPEG", _scan_heic(heic) == fast, str(_scan_heic(heic)))
+
+        png = os.path.join(tmpdir, "image.png")
+        Image.new("RGB", (8, 8)).save(png)
+        fast = _scan_tiff(png)
+        check("Reader: PNG without eXIf handled directly", fast is not None)
+        check("Reader: PNG without eXIf matches exifread", fast == _scan_with_exifread(png))
+
+        png_exif = os.path.join(tmpdir, "exif.png")
+        Image.new("RGB", (8, 8)).save(png_exif, exif=exif.tobytes())
+        fast = _scan_tiff(png_exif)
+        check("Reader: PNG eXIf matches exifread", fast is not None and fast == _scan_with_exifread(png_exif))
+        check("Reader: PNG eXIf marker seen", fast is not None and fast["geosnag_processed"])
+
+
+def test_parse_exif_datetime():
+    """Test that the datetime fast path agrees with strptime."""
+    print("\n── EXIF Datetime Parsing ──")
+    from geosnag.scanner import _DT_FORMATS, _parse_exif_datetime
+
+    def reference(value):
+        for fmt in _DT_FORMATS:
+            try:
+                return datetime.strptime(value.strip(), fmt)
+            except ValueError:
+                continue
+        return None
+
+    samples = [
+        "2017:09:23 23:11:37",
+        "2017-09-23 23:11:37",
+        "2017:09:23 23:11:37.25",
+        " 2020:02:29 00:00:00 ",
+        "0000:00:00 00:00:00",
+        "2021:13:01 00:00:00",
+        "2021:01:01 24:00:00",
+        "2021:01-01 00:00:00",
+        "2021:1:5 3:04:05",
+        "2021:01:01T00:00:00",
+        "    :  :     :  :  ",
+        "",
+    ]
+    for value in samples:
+        got = _parse_exif_datetime(value)
+        check(f"Datetime: {value!r}", got == reference(value), str(got))
+
+
 def test_matcher():
     """Test matching engine with synthetic data — unified photo list."""
     print("\n── Matcher Tests ──")
@@ -203,6 +290,66 @@ def test_matcher():
     )
     check("Match: explicit mode works", stats3.matched == 1, f"got {stats3.matched}")
 
+    # Test 7: Equidistant sources on both sides — the earlier one wins
+    def _src(name, dt):
+        return PhotoMeta(
+            filepath=f"/fake/{name}",
+            filename=name,
+            extension=".heic",
+            datetime_original=dt,
+            has_gps=True,
+            gps_latitude=1.0,
+            gps_longitude=2.0,
+        )
+
+    target_tie = PhotoMeta(
+        filepath="/fake/DSC_TIE.NEF",
+        filename="DSC_TIE.NEF",
+        extension=".nef",
+        datetime_original=datetime(2023, 6, 15, 12, 0, 0),
+    )
+    matches4, _, _ = match_photos(
+        sources=[
+            _src("AFTER.HEIC", datetime(2023, 6, 15, 12, 10, 0)),
+            _src("BEFORE.HEIC", datetime(2023, 6, 15, 11, 50, 0)),
+            _src("EVENING.HEIC", datetime(2023, 6, 15, 18, 0, 0)),
+        ],
+        targets=[target_tie],
+        max_time_delta=timedelta(hours=2),
+    )
+    check(
+        "Match: equidistant tie picks earlier source",
+        matches4[0].source.filename == "BEFORE.HEIC" if matches4 else False,
+    )
+    check("Match: tie delta is +10min", matches4[0].time_delta == timedelta(minutes=10) if matches4 else False)
+
+    # Test 8: Results come back in target input order, not grouped by date
+    def _tgt(name, dt):
+        return PhotoMeta(filepath=f"/fake/{name}", filename=name, extension=".nef", datetime_original=dt)
+
+    day1, day2 = datetime(2023, 6, 15, 12, 0, 0), datetime(2023, 6, 16, 12, 0, 0)
+    interleaved = [
+        _tgt("A_DAY2.NEF", day2),
+        _tgt("B_DAY1.NEF", day1),
+        _tgt("C_NODATE.NEF", None),
+        _tgt("D_DAY2.NEF", day2 + timedelta(minutes=5)),
+        _tgt("E_DAY3.NEF", datetime(2023, 6, 17, 12, 0, 0)),
+        _tgt("F_DAY1.NEF", day1 + timedelta(minutes=5)),
+    ]
+    matches5, unmatched5, _ = match_photos(
+        sources=[_src("S_DAY1.HEIC", day1), _src("S_DAY2.HEIC", day2)],
+        targets=interleaved,
+        max_time_delta=timedelta(hours=2),
+    )
+    check(
+        "Match: matches keep target input order",
+        [m.target.filename for m in matches5] == ["A_DAY2.NEF", "B_DAY1.NEF", "D_DAY2.NEF", "F_DAY1.NEF"],
+    )
+    check(
+        "Match: unmatched keep target input order",
+        [p.filename for p in unmatched5] == ["C_NODATE.NEF", "E_DAY3.NEF"],
+    )
+
 
 def test_writer():
     """Test GPS writing on a copy of the NEF sample."""
@@ -273,6 +420,17 @@ def test_writer():
             check("Write XMP: contains GPS latitude", "GPSLatitude" in xmp_content)
             check("Write XMP: contains GPS longitude", "GPSLongitude" in xmp_content)
             check("Write XMP: contains GeoSnag tag", "GeoSnag" in xmp_content)
+            with open(xmp_path, "rb") as f:
+                check("Write XMP: packet header has UTF-8 BOM", b"begin='\xef\xbb\xbf'" in f.read())
+
+        # An existing (longer) sidecar is overwritten, not appended to
+        with open(xmp_path, "w") as f:
+            f.write("stale" * 1000)
+        result_again = write_gps_xmp_sidecar(test_nef2, latitude=1.5, longitude=2.5, stamp_after_write=False)
+        with open(xmp_path) as f:
+            rewritten = f.read()
+        check("Write XMP: overwrite succeeds", result_again.success, result_again.error or "")
+        check("Write XMP: overwrite replaces content", "stale" not in rewritten and "1,30.000000N" in rewritten)
 
         # Verify XMP stamp was written to original file
         meta_xmp = scan_photo(test_nef2)
@@ -511,6 +669,8 @@ if __name__ == "__main__":
     print("=" * 55)
 
     test_scanner()
+    test_tiff_reader_parity()
+    test_parse_exif_datetime()
     test_matcher()
     test_writer()
     test_processed_skip()
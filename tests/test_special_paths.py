@@ -7,10 +7,13 @@ Covers:
   - scan_directory() on directories with special characters in their names
   - _collect_file_paths() with special character directories
   - Config load_config() reading scan_dirs with special paths
+  - BatchExifWriter with file names that can't be sent over the stay_open pipe
 """
 
+import io
 import os
 import sys
+from unittest.mock import MagicMock, patch
 
 import pytest
 import yaml
@@ -21,6 +24,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 from geosnag.cli import load_config
 from geosnag.parallel import _collect_file_paths
 from geosnag.scanner import scan_directory
+from geosnag.writer import BatchExifWriter
 
 FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
 
@@ -318,3 +322,47 @@ class TestCollectFilePathsSpecialPaths:
             scan_dirs.append(d)
         paths = _collect_file_paths(scan_dirs, {".jpg"}, recursive=True, exclude_patterns=[])
         assert len(paths) == 2
+
+
+# ---------------------------------------------------------------------------
+# BatchExifWriter: names the stay_open argfile can't carry
+# ---------------------------------------------------------------------------
+
+
+class TestBatchWriterSpecialPaths:
+    """One argument per line over a UTF-8 pipe: such names must go through argv."""
+
+    def _write(self, filepath: str):
+        proc = MagicMock()
+        proc.stdin = io.StringIO()
+        proc.stdout = io.StringIO("    1 image files updated\n{ready1}\n    1 image files updated\n{ready2}\n")
+        proc.stderr = io.StringIO("{ready_err:1}\n{ready_err:2}\n")
+        proc.poll.return_value = None
+        with patch("geosnag.writer._exiftool_runs", return_value=True):
+            with patch("subprocess.Popen", return_value=proc) as mock_popen, patch("subprocess.run") as mock_run:
+                mock_run.return_value = MagicMock(returncode=0, stderr="")
+                batch = BatchExifWriter(["exiftool"])
+                batch.write_gps(filepath, 59.9, 10.7, None, "GeoSnag:test")
+                batch.stamp(filepath, "GeoSnag:test")
+        return mock_popen, mock_run
+
+    @pytest.mark.parametrize(
+        "filepath",
+        [
+            "/photos/two\nlines.jpg",
+            "/photos/latin1-\udce9t\udce9.jpg",  # undecodable bytes, surrogate-escaped by os.fsdecode
+            "/photos/trailing space.jpg ",
+        ],
+    )
+    def test_unsafe_name_uses_one_shot_argv(self, filepath):
+        mock_popen, mock_run = self._write(filepath)
+        mock_popen.assert_not_called()
+        assert mock_run.call_count == 2
+        for call in mock_run.call_args_list:
+            assert call[0][0][-1] == filepath
+
+    @pytest.mark.parametrize("dir_name", SPECIAL_DIR_NAMES)
+    def test_special_dir_names_stay_on_batch(self, dir_name):
+        mock_popen, mock_run = self._write(f"/photos/{dir_name}/IMG_0001.jpg")
+        mock_popen.assert_called_once()
+        mock_run.assert_not_called()
@@ -4,31 +4,54 @@ Unit tests for geosnag/writer.py.
 Covers:
 - _probe_cmd: all subprocess failure modes
 - _has_pyexiv2: module missing, glibc OSError, other exception
-- _find_exiftool: system binary probe, each candidate path
+- _find_exiftool: PATH / candidate lookup without running exiftool
+- _exiftool_runs / _resolve_exiftool: one -ver per command, next candidate on failure
 - _write_gps_exiftool: correct subprocess args for every combination
 - _stamp_exiftool: correct subprocess args, non-zero exit raises
+- BatchExifWriter: stay_open protocol, error detection, process pool, shutdown
 - write_gps_to_exif: routing to pyexiv2 / exiftool / neither
 - stamp_processed: routing to pyexiv2 / exiftool / neither
+- pyexiv2 backend: calls serialized by _PYEXIV2_LOCK
+- get_run_stamp / reset_run_stamp: one marker per run
 """
 
 from __future__ import annotations
 
+import io
 import subprocess
+import sys
+import threading
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from geosnag import writer as writer_module
 from geosnag.writer import (
+    BatchExifWriter,
+    _exiftool_runs,
     _find_exiftool,
     _has_pyexiv2,
     _probe_cmd,
+    _resolve_exiftool,
     _stamp_exiftool,
     _write_gps_exiftool,
+    get_run_stamp,
+    reset_run_stamp,
     stamp_processed,
     write_gps_to_exif,
 )
 
+
+@pytest.fixture(autouse=True)
+def _exiftool_runs_ok():
+    """Treat every exiftool as runnable, so the lazy -ver check spawns nothing."""
+    with (
+        patch.dict(writer_module._EXIFTOOL_RUNS, clear=True),
+        patch.object(writer_module, "_probe_cmd", return_value=True),
+    ):
+        yield
+
+
 # ---------------------------------------------------------------------------
 # _probe_cmd
 # ---------------------------------------------------------------------------
@@ -44,13 +67,18 @@ class TestProbeCmd:
         with patch("subprocess.run") as mock_run:
             mock_run.return_value = MagicMock(returncode=0)
             _probe_cmd(["exiftool"])
-            mock_run.assert_called_once_with(["exiftool", "-ver"], capture_output=True, timeout=5)
+            mock_run.assert_called_once_with(
+                ["exiftool", "-ver"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=5,
+            )
 
     def test_ver_flag_appended_to_multi_word_cmd(self):
         with patch("subprocess.run") as mock_run:
             mock_run.return_value = MagicMock(returncode=0)
             _probe_cmd(["perl", "/path/to/exiftool"])
-            mock_run.assert_called_once_with(["perl", "/path/to/exiftool", "-ver"], capture_output=True, timeout=5)
+            assert mock_run.call_args[0][0] == ["perl", "/path/to/exiftool", "-ver"]
 
     def test_returns_false_on_nonzero_exit(self):
         with patch("subprocess.run") as mock_run:
@@ -76,20 +104,18 @@ class TestProbeCmd:
 
 
 class TestHasPyexiv2:
-    def test_returns_false_when_spec_not_found(self):
-        with patch("importlib.util.find_spec", return_value=None):
+    def test_returns_false_when_not_installed(self):
+        with patch.dict(sys.modules, {"pyexiv2": None}):
             assert _has_pyexiv2() is False
 
     def test_returns_false_on_oserror(self):
         """Simulates glibc version mismatch on Synology."""
-        with patch("importlib.util.find_spec", return_value=MagicMock()):
-            with patch("builtins.__import__", side_effect=OSError("GLIBC_2.32 not found")):
-                assert _has_pyexiv2() is False
+        with patch("builtins.__import__", side_effect=OSError("GLIBC_2.32 not found")):
+            assert _has_pyexiv2() is False
 
     def test_returns_false_on_other_exception(self):
-        with patch("importlib.util.find_spec", return_value=MagicMock()):
-            with patch("builtins.__import__", side_effect=RuntimeError("unexpected")):
-                assert _has_pyexiv2() is False
+        with patch("builtins.__import__", side_effect=RuntimeError("unexpected")):
+            assert _has_pyexiv2() is False
 
 
 # ---------------------------------------------------------------------------
@@ -99,41 +125,92 @@ class TestHasPyexiv2:
 
 class TestFindExiftool:
     def test_returns_none_when_nothing_available(self):
-        with patch("geosnag.writer._probe_cmd", return_value=False):
+        with patch("shutil.which", return_value=None):
             assert _find_exiftool() is None
 
-    def test_returns_system_binary_when_available(self):
-        def probe(cmd):
-            return cmd == ["exiftool"]
+    def test_returns_resolved_path_when_on_path(self):
+        def which(cmd):
+            return "/usr/local/bin/exiftool" if cmd == "exiftool" else None
 
-        with patch("geosnag.writer._probe_cmd", side_effect=probe):
-            result = _find_exiftool()
-            assert result == ["exiftool"]
+        with patch("shutil.which", side_effect=which):
+            assert _find_exiftool() == ["/usr/local/bin/exiftool"]
 
     def test_returns_opt_bin_when_system_missing(self):
-        def probe(cmd):
-            return cmd == ["/opt/bin/exiftool"]
+        def which(cmd):
+            return cmd if cmd == "/opt/bin/exiftool" else None
 
-        with patch("geosnag.writer._probe_cmd", side_effect=probe):
-            result = _find_exiftool()
-            assert result == ["/opt/bin/exiftool"]
+        with patch("shutil.which", side_effect=which):
+            assert _find_exiftool() == ["/opt/bin/exiftool"]
 
-    def test_system_binary_probed_before_opt_bin(self):
-        probed = []
+    def test_path_lookup_before_opt_bin(self):
+        looked_up = []
 
-        def probe(cmd):
-            probed.append(cmd[0])
-            return False
+        def which(cmd):
+            looked_up.append(cmd)
+            return None
+
+        with patch("shutil.which", side_effect=which):
+            _find_exiftool()
+
+        assert looked_up.index("exiftool") < looked_up.index("/opt/bin/exiftool")
 
-        with patch("geosnag.writer._probe_cmd", side_effect=probe):
+    def test_does_not_run_exiftool(self):
+        with patch("shutil.which", return_value="/usr/bin/exiftool"), patch("subprocess.run") as mock_run:
             _find_exiftool()
+            mock_run.assert_not_called()
+
 
-        assert probed.index("exiftool") < probed.index("/opt/bin/exiftool")
+# ---------------------------------------------------------------------------
+# _exiftool_runs
+# ---------------------------------------------------------------------------
 
-    def test_return_type_is_list(self):
-        with patch("geosnag.writer._probe_cmd", return_value=True):
-            result = _find_exiftool()
-            assert result is None or isinstance(result, list)
+
+class TestExiftoolRuns:
+    def test_probes_once_per_command(self):
+        with patch.object(writer_module, "_probe_cmd", return_value=True) as mock_probe:
+            assert _exiftool_runs(["exiftool"]) is True
+            assert _exiftool_runs(["exiftool"]) is True
+            mock_probe.assert_called_once_with(["exiftool"])
+
+    def test_broken_exiftool_fails_one_shot_write(self):
+        with patch.object(writer_module, "_probe_cmd", return_value=False), patch("shutil.which", return_value=None):
+            with (
+                patch.object(writer_module, "_PYEXIV2_OK", False),
+                patch.object(writer_module, "_EXIFTOOL", ["exiftool"]),
+            ):
+                with patch("subprocess.run") as mock_run:
+                    result = write_gps_to_exif("/tmp/test.NEF", 1.0, 1.0)
+                    mock_run.assert_not_called()
+        assert not result.success
+        assert "does not run" in result.error
+
+    def test_falls_back_to_next_candidate_that_runs(self):
+        paths = {"exiftool": "/usr/bin/exiftool", "/opt/bin/exiftool": "/opt/bin/exiftool"}
+
+        def probe(cmd):
+            return cmd == ["/opt/bin/exiftool"]
+
+        with patch.object(writer_module, "_probe_cmd", side_effect=probe), patch("shutil.which", side_effect=paths.get):
+            with patch.object(writer_module, "_PYEXIV2_OK", False):
+                with patch.object(writer_module, "_EXIFTOOL", ["/usr/bin/exiftool"]):
+                    assert _resolve_exiftool() == ["/opt/bin/exiftool"]
+                    with patch("subprocess.run") as mock_run:
+                        mock_run.return_value = MagicMock(returncode=0, stderr="")
+                        result = write_gps_to_exif("/tmp/test.NEF", 1.0, 1.0)
+                    assert mock_run.call_args[0][0][0] == "/opt/bin/exiftool"
+        assert result.success
+
+    def test_resolve_keeps_working_first_candidate(self):
+        with patch.object(writer_module, "_EXIFTOOL", ["/usr/bin/exiftool"]), patch("shutil.which") as mock_which:
+            assert _resolve_exiftool() == ["/usr/bin/exiftool"]
+            mock_which.assert_not_called()
+
+    def test_broken_exiftool_refuses_batch_start(self):
+        with patch.object(writer_module, "_probe_cmd", return_value=False):
+            with patch("subprocess.Popen") as mock_popen:
+                with pytest.raises(RuntimeError, match="does not run"):
+                    BatchExifWriter(["exiftool"]).stamp("/tmp/a.NEF", "stamp")
+                mock_popen.assert_not_called()
 
 
 # ---------------------------------------------------------------------------
@@ -265,6 +342,166 @@ class TestStampExiftool:
                 _stamp_exiftool("/tmp/test.NEF", "stamp", ["exiftool"])
 
 
+# ---------------------------------------------------------------------------
+# BatchExifWriter
+# ---------------------------------------------------------------------------
+
+
+def _fake_stay_open(stdout: str, stderr: str) -> MagicMock:
+    proc = MagicMock()
+    proc.stdin = io.StringIO()
+    proc.stdout = io.StringIO(stdout)
+    proc.stderr = io.StringIO(stderr)
+    proc.poll.return_value = None
+    return proc
+
+
+class TestBatchExifWriter:
+    def test_starts_single_stay_open_process(self):
+        proc = _fake_stay_open(
+            "    1 image files updated\n{ready1}\n    1 image files updated\n{ready2}\n",
+            "{ready_err:1}\n{ready_err:2}\n",
+        )
+        with patch("subprocess.Popen", return_value=proc) as mock_popen:
+            with BatchExifWriter(["exiftool"]) as batch:
+                batch.write_gps("/tmp/a.NEF", 59.9, 10.7, None, None)
+                batch.stamp("/tmp/b.NEF", "GeoSnag:v0.1.1")
+            mock_popen.assert_called_once()
+            assert mock_popen.call_args[0][0] == ["exiftool", "-stay_open", "True", "-@", "-"]
+
+    def test_command_is_one_arg_per_line_with_execute(self):
+        proc = _fake_stay_open("    1 image files updated\n{ready1}\n", "{ready_err:1}\n")
+        with patch("subprocess.Popen", return_value=proc):
+            batch = BatchExifWriter(["exiftool"])
+            batch.write_gps("/tmp/a.NEF", -33.8, 10.7, None, None)
+            lines = proc.stdin.getvalue().splitlines()
+        assert "-GPSLatitudeRef=S" in lines
+        assert lines[-4:] == ["/tmp/a.NEF", "-echo4", "{ready_err:1}", "-execute1"]
+
+    def test_raises_on_error_output(self):
+        proc = _fake_stay_open(
+            "    0 image files updated\n    1 files weren't updated due to errors\n{ready1}\n",
+            "Error: File not found - /tmp/a.NEF\n{ready_err:1}\n",
+        )
+        with patch("subprocess.Popen", return_value=proc):
+            with pytest.raises(RuntimeError, match="File not found"):
+                BatchExifWriter(["exiftool"]).stamp("/tmp/a.NEF", "stamp")
+
+    def test_warnings_are_not_errors(self):
+        proc = _fake_stay_open("    1 image files updated\n{ready1}\n", "Warning: minor issue\n{ready_err:1}\n")
+        with patch("subprocess.Popen", return_value=proc):
+            BatchExifWriter(["exiftool"]).stamp("/tmp/a.NEF", "stamp")
+
+    def test_raises_when_process_exits(self):
+        proc = _fake_stay_open("", "")
+        with patch("subprocess.Popen", return_value=proc):
+            with pytest.raises(RuntimeError, match="exited unexpectedly"):
+                BatchExifWriter(["exiftool"]).stamp("/tmp/a.NEF", "stamp")
+
+    def test_hung_process_times_out_and_is_dropped(self):
+        proc = _fake_stay_open("", "")
+        killed = threading.Event()
+        proc.kill.side_effect = killed.set
+        proc.stdout = MagicMock()
+        proc.stdout.readline.side_effect = lambda: "" if killed.wait(5) else "never\n"
+        with patch("subprocess.Popen", return_value=proc):
+            batch = BatchExifWriter(["exiftool"], timeout=0.05)
+            with pytest.raises(RuntimeError, match="timed out"):
+                batch.stamp("/tmp/a.NEF", "stamp")
+        proc.kill.assert_called()
+        assert batch._procs == []
+
+    def test_exited_process_is_replaced(self):
+        dead = _fake_stay_open("", "")
+        live = _fake_stay_open("    1 image files updated\n{ready2}\n", "{ready_err:2}\n")
+        with patch("subprocess.Popen", side_effect=[dead, live]) as mock_popen:
+            batch = BatchExifWriter(["exiftool"])
+            with pytest.raises(RuntimeError, match="exited unexpectedly"):
+                batch.stamp("/tmp/a.NEF", "stamp")
+            batch.stamp("/tmp/b.NEF", "stamp")
+            assert mock_popen.call_count == 2
+        assert batch._procs == [live]
+        assert "/tmp/b.NEF" in live.stdin.getvalue()
+
+    def test_process_that_exited_while_idle_is_not_reused(self):
+        first = _fake_stay_open("    1 image files updated\n{ready1}\n", "{ready_err:1}\n")
+        second = _fake_stay_open("    1 image files updated\n{ready2}\n", "{ready_err:2}\n")
+        with patch("subprocess.Popen", side_effect=[first, second]) as mock_popen:
+            batch = BatchExifWriter(["exiftool"], processes=2)
+            batch.stamp("/tmp/a.NEF", "stamp")
+            first.poll.return_value = 1  # died between commands
+            batch.stamp("/tmp/b.NEF", "stamp")
+            assert mock_popen.call_count == 2
+        first.kill.assert_called_once()
+        assert batch._procs == [second]
+        assert "/tmp/b.NEF" in second.stdin.getvalue()
+
+    def test_close_sends_stay_open_false(self):
+        proc = _fake_stay_open("    1 image files updated\n{ready1}\n", "{ready_err:1}\n")
+        stdin = proc.stdin
+        stdin.close = MagicMock()
+        with patch("subprocess.Popen", return_value=proc):
+            with BatchExifWriter(["exiftool"]) as batch:
+                batch.stamp("/tmp/a.NEF", "stamp")
+        assert stdin.getvalue().endswith("-stay_open\nFalse\n")
+        proc.wait.assert_called_once()
+
+    def test_registers_atexit_until_closed(self):
+        proc = _fake_stay_open("    1 image files updated\n{ready1}\n", "{ready_err:1}\n")
+        proc.stdin.close = MagicMock()
+        with patch("subprocess.Popen", return_value=proc):
+            with patch("atexit.register") as mock_reg, patch("atexit.unregister") as mock_unreg:
+                with BatchExifWriter(["exiftool"]) as batch:
+                    batch.stamp("/tmp/a.NEF", "stamp")
+                    mock_reg.assert_called_once_with(batch.close)
+                    mock_unreg.assert_not_called()
+                mock_unreg.assert_called_once_with(batch.close)
+
+    def test_sequential_commands_reuse_one_process(self):
+        proc = _fake_stay_open(
+            "    1 image files updated\n{ready1}\n    1 image files updated\n{ready2}\n",
+            "{ready_err:1}\n{ready_err:2}\n",
+        )
+        with patch("subprocess.Popen", return_value=proc) as mock_popen:
+            batch = BatchExifWriter(["exiftool"], processes=4)
+            batch.stamp("/tmp/a.NEF", "stamp")
+            batch.stamp("/tmp/b.NEF", "stamp")
+            mock_popen.assert_called_once()
+
+    def test_busy_processes_start_more_up_to_limit(self):
+        procs = [_fake_stay_open("", "") for _ in range(2)]
+        for proc in procs:
+            proc.stdin.close = MagicMock()
+        with patch("subprocess.Popen", side_effect=procs) as mock_popen:
+            batch = BatchExifWriter(["exiftool"], processes=2)
+            first = batch._acquire()
+            second = batch._acquire()
+            assert {first, second} == set(procs)
+            batch._idle.put(first)
+            assert batch._acquire() is first
+            assert mock_popen.call_count == 2
+            batch.close()
+        for proc in procs:
+            assert proc.stdin.getvalue().endswith("-stay_open\nFalse\n")
+            proc.wait.assert_called_once()
+
+    def test_no_process_when_unused(self):
+        with patch("subprocess.Popen") as mock_popen:
+            with BatchExifWriter(["exiftool"]):
+                pass
+            mock_popen.assert_not_called()
+
+    def test_write_gps_to_exif_routes_through_batch(self):
+        batch = MagicMock()
+        with patch.object(writer_module, "_PYEXIV2_OK", False):
+            with patch.object(writer_module, "_EXIFTOOL", ["exiftool"]):
+                with patch("geosnag.writer._write_gps_exiftool") as mock_et:
+                    result = write_gps_to_exif("/tmp/test.NEF", 1.0, 1.0, batch=batch)
+                    mock_et.assert_not_called()
+        batch.write_gps.assert_called_once()
+        assert result.success
+
+
 # ---------------------------------------------------------------------------
 # write_gps_to_exif — backend routing
 # ---------------------------------------------------------------------------
@@ -356,3 +593,63 @@ class TestStampProcessedRouting:
         with patch.object(writer_module, "_PYEXIV2_OK", True):
             with patch("geosnag.writer._stamp_pyexiv2", side_effect=RuntimeError("disk full")):
                 assert stamp_processed("/tmp/test.NEF") is False
+
+
+# ---------------------------------------------------------------------------
+# pyexiv2 backend — calls serialized
+# ---------------------------------------------------------------------------
+
+
+class TestPyexiv2Lock:
+    def _image_checking_lock(self, seen):
+        def make(path):
+            seen.append(writer_module._PYEXIV2_LOCK.locked())
+            return MagicMock()
+
+        return make
+
+    def test_gps_write_holds_lock(self):
+        seen = []
+        with patch("pyexiv2.Image", side_effect=self._image_checking_lock(seen)):
+            writer_module._write_gps_pyexiv2("/tmp/a.NEF", 1.0, 1.0, None, None)
+        assert seen == [True]
+        assert not writer_module._PYEXIV2_LOCK.locked()
+
+    def test_stamp_holds_lock(self):
+        seen = []
+        with patch("pyexiv2.Image", side_effect=self._image_checking_lock(seen)):
+            writer_module._stamp_pyexiv2("/tmp/a.NEF", "stamp")
+        assert seen == [True]
+
+
+# ---------------------------------------------------------------------------
+# get_run_stamp / reset_run_stamp
+# ---------------------------------------------------------------------------
+
+
+class TestRunStamp:
+    def test_stamp_reused_within_run(self):
+        reset_run_stamp()
+        with patch("geosnag.writer._make_stamp", side_effect=["GeoSnag:a", "GeoSnag:b"]) as mock_make:
+            assert get_run_stamp() == "GeoSnag:a"
+            assert get_run_stamp() == "GeoSnag:a"
+            mock_make.assert_called_once()
+        reset_run_stamp()
+
+    def test_reset_starts_new_run(self):
+        reset_run_stamp()
+        with patch("geosnag.writer._make_stamp", side_effect=["GeoSnag:a", "GeoSnag:b"]):
+            get_run_stamp()
+            reset_run_stamp()
+            assert get_run_stamp() == "GeoSnag:b"
+        reset_run_stamp()
+
+    def test_writes_share_run_stamp(self):
+        reset_run_stamp()
+        with patch.object(writer_module, "_PYEXIV2_OK", True):
+            with patch("geosnag.writer._write_gps_pyexiv2") as mock_write:
+                with patch("geosnag.writer._stamp_pyexiv2") as mock_stamp:
+                    write_gps_to_exif("/tmp/a.NEF", 1.0, 2.0)
+                    stamp_processed("/tmp/b.NEF")
+        assert mock_write.call_args[0][4] == mock_stamp.call_args[0][1] == get_run_stamp()
+        reset_run_stamp()